@@ -3,11 +3,10 @@ import streamlit as st
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
 from modules.db.db_records import get_records_db
-from modules.util.db_util import get_isak
+from modules.util.db_util import get_home_summary, get_isak
 from modules.util.util import clean_df, data_format
 from modules.ui.ui_app import (
     filter_df_by_period,
-    calc_metric_block,
     render_metric_cards
 )
 
@@ -20,12 +19,14 @@ st.header(t("Resumen de :red[1er Equipo]"), divider="red")
 # ============================================================
 # CARGA DE DATOS
 # ============================================================
-df_records = get_isak()
+# Las tarjetas se pintan desde el resumen agregado; el histórico completo
+# solo se carga para la tabla de registros del periodo (bajo demanda)
+resumen = get_home_summary()
 
 #records_df = get_records_db()
 #st.dataframe(df_records)
 
-if df_records.empty:
+if not resumen:
     st.warning(t("No hay registros disponibles."))
     st.stop()
 
@@ -57,17 +58,19 @@ with col1:
         index=list(OPCIONES_PERIODO.keys()).index("Última sesión"))
 
     periodo = next(k for k, v in OPCIONES_PERIODO.items() if v == periodo_traducido)
-    df_periodo, articulo = filter_df_by_period(df_records, periodo)
+    resumen_periodo = resumen[periodo]
+    articulo = t(resumen_periodo["articulo"])
 
 #st.dataframe(df, hide_index=True)
 #st.dataframe(df_periodo, hide_index=True)
 
-# Cálculos principales
+# Cálculos principales (precalculados en el resumen)
+metricas = resumen_periodo["metricas"]
 
-peso_prom, chart_peso, delta_peso = calc_metric_block(df_periodo, periodo, "peso_bruto_kg", "mean")
-grasa_prom, chart_grasa, delta_grasa = calc_metric_block(df_periodo, periodo, "ajuste_adiposa_pct", "mean")
-musculo_prom, chart_musculo, delta_musculo = calc_metric_block(df_periodo, periodo, "ajuste_muscular_pct", "mean")
-indice_mo_prom, chart_mo, delta_mo = calc_metric_block(df_periodo, periodo, "idx_musculo_oseo", "mean")
+peso_prom, chart_peso, delta_peso = metricas["peso_bruto_kg"]
+grasa_prom, chart_grasa, delta_grasa = metricas["ajuste_adiposa_pct"]
+musculo_prom, chart_musculo, delta_musculo = metricas["ajuste_muscular_pct"]
+indice_mo_prom, chart_mo, delta_mo = metricas["idx_musculo_oseo"]
 
 #alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas = calc_alertas(df_periodo, df, periodo)
 
@@ -95,7 +98,14 @@ render_metric_cards(
 st.divider()
 st.markdown(t("**Registros del periodo seleccionado**") + f"(:blue-background[{periodo_traducido}])")
 
-st.dataframe(clean_df(df_periodo))
+# El histórico completo solo se carga si se pide la tabla: el primer render
+# de la portada usa únicamente el resumen agregado
+if st.toggle(t("Mostrar registros"), key="home_mostrar_registros"):
+    df_periodo, _ = filter_df_by_period(get_isak(), periodo)
+    if df_periodo.empty:
+        st.info(t("No hay registros disponibles en este periodo."))
+    else:
+        st.dataframe(clean_df(df_periodo))
 # # --- Fila principal de filtros ---
 # col1, col2, _ = st.columns([1.5, 1.5, 1])
 
@@ -120,6 +130,3 @@ st.dataframe(clean_df(df_periodo))
 #         t(":material/report_problem: Pendientes de registro")
 #     ])
 
-if df_periodo.empty:
-    st.info(t("No hay registros disponibles en este periodo."))
-    st.stop()
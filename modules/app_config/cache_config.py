@@ -0,0 +1,35 @@
+from modules.auth_system.auth_config import get_secret
+
+# ============================
+# 🗄️ CONFIGURACIÓN DE CACHÉS
+# ============================
+
+def _flag(valor) -> bool:
+    """Interpreta un secreto booleano ("false" / "0" / "off" son False)."""
+    return str(valor).strip().lower() in ("1", "true", "yes", "on")
+
+# Carpeta base para cachés persistentes en disco (no versionada)
+CACHE_DIR = get_secret("cache", "dir", "data/cache")
+
+# --- Memo de composición corporal (calcular_antropometria) ---
+ISAK_MEMO_MAXSIZE = int(get_secret("cache", "isak_memo_maxsize", 4096))
+ISAK_MEMO_PERSIST = _flag(get_secret("cache", "isak_memo_persist", True))
+ISAK_MEMO_DIR = get_secret("cache", "isak_memo_dir", f"{CACHE_DIR}/isak_memo")
+
+# --- Snapshot columnar del dataset calculado (arranque en frío) ---
+SNAPSHOT_ENABLED = _flag(get_secret("cache", "snapshot_enabled", True))
+SNAPSHOT_DIR = get_secret("cache", "snapshot_dir", f"{CACHE_DIR}/snapshots")
+
+# --- Presupuesto de memoria de las cachés LRU (budget_cache) ---
+CACHE_BUDGET_MB = float(get_secret("cache", "budget_mb", 256))
+
+# --- Fotos de jugadoras (caché en disco + miniaturas) ---
+PHOTO_DIR = get_secret("cache", "photo_dir", f"{CACHE_DIR}/photos")
+PHOTO_TIMEOUT_S = float(get_secret("cache", "photo_timeout", 4))
+PHOTO_THUMB_PX = int(get_secret("cache", "photo_thumb_px", 300))
+PHOTO_REVALIDATE_S = int(get_secret("cache", "photo_revalidate", 24 * 3600))
+PHOTO_PREFETCH_WORKERS = int(get_secret("cache", "photo_prefetch_workers", 8))
+PHOTO_PREFETCH_PER_HOST = int(get_secret("cache", "photo_prefetch_per_host", 4))
+
+# --- Figuras Plotly serializadas (figure_cache) ---
+FIGURE_CACHE_TTL = int(get_secret("cache", "figure_ttl", 3600))
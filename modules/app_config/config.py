@@ -1,12 +1,23 @@
+import pandas as pd
 import streamlit as st
 from modules.auth_system.auth_core import bootstrap_auth_from_cookie, init_app_state, validate_login
 from modules.auth_system.auth_ui import login_view, menu
+from modules.app_config.prewarm import start_prewarm
 import uuid
 
+# Copy-on-write: los DataFrames cacheados se comparten entre reruns y
+# sesiones; los filtros devuelven vistas y ninguna modificación se propaga
+# al original. pandas 3 lo aplica siempre (y la opción está obsoleta).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 def init_config():
     # Streamlit page config
     st.set_page_config(page_title="Dux Logroño - Antropometria", page_icon="assets/images/logo_transparente.png", layout="wide")
 
+    # Precalentar cachés en segundo plano (una vez por proceso)
+    start_prewarm()
+
     # Generar un ID único por navegador/pestaña
     if "client_session_id" not in st.session_state:
         st.session_state["client_session_id"] = uuid.uuid4().hex
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import streamlit as st
+
+from modules.db.db_catalogs import load_catalog_list_db
+from modules.db.db_competitions import load_competitions_db
+from modules.db.db_players import load_players_db
+from modules.util.db_util import get_home_summary, get_isak
+from modules.util.photo_cache import start_photo_prefetch
+
+# Cargas que se precalientan al arrancar (nombre, función)
+PREWARM_LOADERS = [
+    ("jugadoras", load_players_db),
+    # Fotos nuevas o caducadas a disco (hilo propio, no bloquea el resto)
+    ("fotos", lambda: start_photo_prefetch(load_players_db())),
+    ("competiciones", load_competitions_db),
+    ("tipo_ausencia", lambda: load_catalog_list_db("tipo_ausencia", as_df=True)),
+    ("isak", lambda: get_isak(scope="staff")),
+    ("resumen", lambda: get_home_summary(scope="staff")),
+]
+
+def _prewarm():
+    for nombre, loader in PREWARM_LOADERS:
+        inicio = time.perf_counter()
+        try:
+            loader()
+            print(f"Prewarm {nombre}: {time.perf_counter() - inicio:.2f}s")
+        except Exception as e:
+            print(f"Prewarm {nombre} falló: {e}")
+
+@st.cache_resource(show_spinner=False)
+def start_prewarm() -> threading.Thread:
+    """
+    Lanza (una sola vez por proceso) el precalentamiento de cachés en un
+    hilo en segundo plano.
+
+    Streamlit no expone un hook de arranque del servidor: se dispara en la
+    primera ejecución de script del proceso, sin bloquearla, de modo que la
+    pantalla de login se muestra mientras se cargan los datos.
+    """
+    thread = threading.Thread(target=_prewarm, name="cache-prewarm", daemon=True)
+    thread.start()
+    return thread
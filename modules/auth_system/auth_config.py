@@ -30,6 +30,21 @@ COOKIE_NAME = get_secret("auth", "cookie_name", "dev_cookie")
 COOKIE_EXP_DAYS = int(get_secret("auth", "cookie_expiration_days", 1))
 APP_NAME = get_secret("auth", "app_name", "antropometria_dux_logrono")
 
+# --- BCRYPT ---
+BCRYPT_ROUNDS = int(get_secret("auth", "bcrypt_rounds", 12))    # coste objetivo (rehash al entrar)
+BCRYPT_WORKERS = int(get_secret("auth", "bcrypt_workers", 2))   # hilos para verificar / generar hashes
+BCRYPT_TIMEOUT_S = float(get_secret("auth", "bcrypt_timeout", 5))
+
+# --- RBAC (caché de usuarios y permisos, segundos) ---
+RBAC_TTL = int(get_secret("auth", "rbac_ttl", 300))
+
+# --- SESIONES EN SERVIDOR ---
+# "memory" | "sqlite" | "off" (solo cookie)
+SESSION_STORE = get_secret("auth", "session_store", "memory")
+SESSION_STORE_PATH = get_secret("auth", "session_store_path", "data/cache/sessions.sqlite")
+# Cookie con la clave opaca del almacén (nunca en la URL)
+SESSION_COOKIE_NAME = get_secret("auth", "session_cookie_name", f"{COOKIE_NAME}_sk")
+
 # --- SERVER CONFIG ---
 COMPONENT_DOMAIN = get_secret("server", "component_domain", "localhost")
 SERVER_ENV = get_secret("server", "component_enviroment", "development")
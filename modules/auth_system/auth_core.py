@@ -1,13 +1,18 @@
 # src/auth_system/auth_core.py
 
 import datetime
+import secrets
+import time
 import uuid
-import bcrypt
+import bcrypt  # noqa: F401  (los tests sustituyen bcrypt.checkpw)
 import jwt
 import streamlit as st
 
 from modules.auth_system import auth_config
-from .cookie_manager import cookie_set, cookie_get, cookie_delete
+from modules.db.db_login import update_password_hash
+from .cookie_manager import app_cookie_delete, app_cookie_set, cookie_set, cookie_get, cookie_delete
+from .passwords import PasswordCheckTimeout, hash_password, needs_rehash, verify_password
+from .session_store import get_session_store
 
 # ======================================================
 # Helpers internos de estado
@@ -64,6 +69,77 @@ def decode_jwt(token):
     except Exception:
         return None
 
+# Margen antes de `exp` a partir del cual se vuelve a verificar la firma
+_REVERIFY_MARGIN_S = 60
+
+def _remember_payload(token, payload):
+    """Guarda en la sesión el payload ya verificado de `token` (con su exp)."""
+    if payload and payload.get("exp"):
+        st.session_state["_auth_verified"] = {"token": token, "payload": payload}
+    else:
+        st.session_state.pop("_auth_verified", None)
+
+def _verified_payload(token):
+    """
+    Payload de `token` sin repetir jwt.decode en cada rerun: solo se
+    verifica de nuevo si el token cambió o su expiración está cerca.
+    """
+    cached = st.session_state.get("_auth_verified")
+    if (
+        cached
+        and cached["token"] == token
+        and time.time() < cached["payload"]["exp"] - _REVERIFY_MARGIN_S
+    ):
+        return cached["payload"]
+
+    payload = decode_jwt(token)
+    _remember_payload(token, payload)
+    return payload
+
+
+# ======================================================
+# Sesión en servidor (un solo ciclo, ver session_store)
+# ======================================================
+
+def _store_key_from_request():
+    """
+    Clave del almacén enviada por el navegador como cookie HTTP en la
+    petición de la sesión (st.context.cookies). Se escribe en el origen de
+    la app (app_cookie_set) y nunca viaja en la URL.
+    """
+    try:
+        return st.context.cookies.get(auth_config.SESSION_COOKIE_NAME)
+    except Exception:
+        return None
+
+
+def _restore_from_store():
+    """Restaura la sesión desde el almacén si la cookie de sesión llegó en la petición."""
+    store = get_session_store()
+    if store is None:
+        return False
+
+    key = _store_key_from_request()
+    token = store.get(key)
+    if not token:
+        return False
+
+    payload = _verified_payload(token)
+    if not payload:
+        store.delete(key)
+        return False
+
+    st.session_state["_auth_store_key"] = key
+    st.session_state["auth"].update({
+        "is_logged_in": True,
+        "username": payload["user"],
+        "name": payload.get("name", ""),
+        "rol": payload["rol"],
+        "token": token,
+        "session_id": payload["sid"],
+    })
+    return True
+
 
 # ======================================================
 # BOOTSTRAP: Recuperar sesión desde cookie (doble ciclo)
@@ -116,6 +192,11 @@ def bootstrap_auth_from_cookie():
         #st.text("Bootstrap ya completado previamente.")
         return
 
+    # Sesión guardada en servidor: se restaura sin esperar a la cookie
+    if _restore_from_store():
+        st.session_state["_auth_bootstrap_done"] = True
+        return
+
     # Pedimos la cookie (primer ciclo devuelve None)
     cookie_token = cookie_get(auth_config.COOKIE_NAME)
     #st.text(f"DEBUG cookie_token: {cookie_token}, name: {auth_config.COOKIE_NAME}")
@@ -128,7 +209,7 @@ def bootstrap_auth_from_cookie():
 
     # Segundo ciclo: ahora sí debería existir valor
     if isinstance(cookie_token, str) and cookie_token.strip():
-        payload = decode_jwt(cookie_token)
+        payload = _verified_payload(cookie_token)
         if payload:
             st.session_state["auth"].update({
                 "is_logged_in": True,
@@ -160,7 +241,7 @@ def get_current_user():
     if not token:
         return None
 
-    payload = decode_jwt(token)
+    payload = _verified_payload(token)
     if not payload:
         logout()
         return None
@@ -181,6 +262,13 @@ def logout():
 
     # 1) Marcar que hay un logout en curso
     st.session_state["_logout_pending"] = True
+    st.session_state.pop("_auth_verified", None)
+
+    store = get_session_store()
+    store_key = st.session_state.pop("_auth_store_key", None)
+    if store is not None and store_key:
+        store.delete(store_key)
+        app_cookie_delete(auth_config.SESSION_COOKIE_NAME)
 
     # 2) Pedir al componente que borre la cookie en el navegador
     cookie_delete(auth_config.COOKIE_NAME)
@@ -198,22 +286,42 @@ def logout():
 # Login desde auth_ui
 # ======================================================
 
+def _rehash_password(user, password):
+    try:
+        update_password_hash(user["id"], hash_password(password))
+    except Exception as e:
+        # El login sigue adelante con el hash anterior
+        print(f"Rehash de contraseña omitido: {e}")
+
+
 def validate_access(password, user):
     """Valida contraseña, permisos y registra la sesión."""
-    if not bcrypt.checkpw(password.encode(), user["password_hash"].encode()):
+    try:
+        valida = verify_password(password, user["password_hash"])
+    except PasswordCheckTimeout:
+        st.error("Servidor ocupado, inténtalo de nuevo en unos segundos")
+        return
+
+    if not valida:
         st.error("Credenciales incorrectas")
         return
 
-    permisos = [p.strip() for p in user.get("permissions", "").split(",")]
+    permisos = user.get("permission_set") or [p.strip() for p in user.get("permissions", "").split(",")]
     #st.text(f"DEBUG permisos del usuario: {permisos}")
     if auth_config.APP_NAME not in permisos:
         st.error("No tienes permiso para acceder a esta app")
         return
 
+    # Coste bcrypt distinto del configurado: se actualiza el hash ahora que
+    # tenemos la contraseña en claro (hashes no bcrypt se dejan como están)
+    if needs_rehash(user["password_hash"]):
+        _rehash_password(user, password)
+
     name = f"{user.get('name','')}".strip() #{user.get('lastname','')}".strip()
     # Crear token
     token = create_jwt(name, user["email"], user["role_name"])
     payload = decode_jwt(token)
+    _remember_payload(token, payload)
 
     # Registrar sesión en memoria + cookie
     st.session_state["auth"].update({
@@ -225,5 +333,12 @@ def validate_access(password, user):
         "session_id": payload["sid"]
     })
 
-    # Guardar cookie real del navegador
+    # Guardar sesión en servidor (restauración en un ciclo) y cookie real
+    store = get_session_store()
+    if store is not None and payload.get("exp"):
+        store_key = secrets.token_urlsafe(32)
+        store.put(store_key, token, payload["exp"])
+        st.session_state["_auth_store_key"] = store_key
+        app_cookie_set(auth_config.SESSION_COOKIE_NAME, store_key, days=auth_config.COOKIE_EXP_DAYS)
+
     cookie_set(auth_config.COOKIE_NAME, token, days=auth_config.COOKIE_EXP_DAYS)
@@ -3,6 +3,8 @@ from modules.db.db_login import load_user_from_db
 from modules.auth_system.auth_core import logout, validate_access
 from modules.util.util import right_caption, set_background_image_local
 from modules.i18n.i18n import t, language_selector
+from modules.util.budget_cache import clear_budget_caches
+from modules.util.db_util import reset_isak_caches
 
 def login_view() -> None:
     """Renderiza el formulario de inicio de sesión."""
@@ -64,6 +66,8 @@ def menu():
             if st.button(t("Limpiar cache & reiniciar"), type="tertiary", icon=":material/refresh:"):
                     st.cache_data.clear()
                     st.cache_resource.clear()
+                    clear_budget_caches()
+                    reset_isak_caches()
 
                     st.success("Cache cleared successfully.")
                     st.rerun()
@@ -1,3 +1,5 @@
+import json
+
 import streamlit.components.v1 as components
 
 from modules.auth_system import auth_config
@@ -34,4 +36,33 @@ def cookie_delete(name: str, **kwargs):
         action="delete",
         name=name,
         **kwargs
-    )
\ No newline at end of file
+    )
+
+# ------------------------------------------------------------
+# Cookies en el origen de la app
+# ------------------------------------------------------------
+# En prod el componente se sirve desde COMPONENT_DOMAIN (otro origen): lo
+# que escribe no viaja en las peticiones a la app ni aparece en
+# st.context.cookies. Las cookies que el servidor tiene que leer en el
+# primer run se escriben desde un iframe srcdoc, que comparte el origen
+# de la app, sobre el documento principal.
+
+def app_cookie_string(name: str, value: str, days: float = 7) -> str:
+    """Valor de document.cookie para `name` (days=0 la borra)."""
+    return f"{name}={value}; Max-Age={int(days * 86400)}; Path=/; SameSite=Strict"
+
+def _write_app_cookie(cookie: str):
+    components.html(
+        "<script>"
+        "const doc = window.parent.document;"
+        f"doc.cookie = {json.dumps(cookie)}"
+        " + (window.parent.location.protocol === 'https:' ? '; Secure' : '');"
+        "</script>",
+        height=0,
+    )
+
+def app_cookie_set(name: str, value: str, days: int = 7):
+    _write_app_cookie(app_cookie_string(name, value, days))
+
+def app_cookie_delete(name: str):
+    _write_app_cookie(app_cookie_string(name, "", 0))
@@ -0,0 +1,52 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+from modules.auth_system import auth_config
+
+# ============================================================
+#  🔹 CONTRASEÑAS (bcrypt fuera del hilo del script)
+# ============================================================
+#
+# bcrypt libera el GIL: un pool pequeño de hilos permite atender varios
+# logins a la vez sin que se serialicen en el hilo de Streamlit, y el
+# límite de trabajadores acota la CPU dedicada a hashing. Cada operación
+# tiene un presupuesto de tiempo (incluida la espera en cola).
+
+class PasswordCheckTimeout(Exception):
+    """La verificación no terminó dentro de BCRYPT_TIMEOUT_S."""
+
+_executor = ThreadPoolExecutor(
+    max_workers=auth_config.BCRYPT_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+
+_BCRYPT_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$[./A-Za-z0-9]{53}$")
+
+def _run(func, *args):
+    future = _executor.submit(func, *args)
+    try:
+        return future.result(timeout=auth_config.BCRYPT_TIMEOUT_S)
+    except FutureTimeout:
+        future.cancel()
+        raise PasswordCheckTimeout()
+
+def verify_password(password: str, hashed: str) -> bool:
+    """bcrypt.checkpw en el pool. Lanza PasswordCheckTimeout si no hay respuesta a tiempo."""
+    return _run(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hash bcrypt con el coste configurado (BCRYPT_ROUNDS)."""
+    salt = bcrypt.gensalt(rounds=rounds or auth_config.BCRYPT_ROUNDS)
+    return _run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+def hash_rounds(hashed: str) -> int | None:
+    """Coste (log2 de rondas) de un hash bcrypt, o None si no es un hash bcrypt válido."""
+    match = _BCRYPT_RE.match(hashed or "")
+    return int(match.group(1)) if match else None
+
+def needs_rehash(hashed: str) -> bool:
+    """True si el hash es bcrypt y su coste no coincide con BCRYPT_ROUNDS."""
+    rounds = hash_rounds(hashed)
+    return rounds is not None and rounds != auth_config.BCRYPT_ROUNDS
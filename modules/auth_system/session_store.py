@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from modules.auth_system import auth_config
+
+# ============================================================
+#  🔹 SESIONES EN SERVIDOR (clave opaca → token)
+# ============================================================
+#
+# Restaurar la sesión desde la cookie del JWT exige dos reruns (el
+# componente devuelve la cookie en el segundo). Al iniciar sesión el token
+# se guarda también aquí bajo una clave aleatoria que solo se entrega al
+# navegador como cookie (SESSION_COOKIE_NAME), escrita en el origen de la
+# app (cookie_manager.app_cookie_set) y no en el del componente. El
+# navegador la envía en la petición de cada sesión nueva, así que una
+# recarga o pestaña nueva la lee con st.context.cookies en el primer run.
+# Nunca se pone en la URL: un enlace compartido no da acceso. Si no hay
+# cookie o entrada (caducada, almacén reiniciado), se sigue el camino de
+# la cookie del JWT.
+#
+# - "memory": diccionario del proceso (se pierde al reiniciar)
+# - "sqlite": además, archivo local que sobrevive a reinicios
+
+class SessionStore:
+    def __init__(self, path: str | None = None):
+        self._memoria: dict[str, tuple[str, int]] = {}
+        self._lock = threading.Lock()
+        self._path = Path(path) if path else None
+
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sesiones_clave ("
+                    " clave TEXT PRIMARY KEY, token TEXT NOT NULL, exp INTEGER NOT NULL)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=5)
+
+    def put(self, clave: str, token: str, exp: int) -> None:
+        with self._lock:
+            self._memoria[clave] = (token, int(exp))
+            self._purgar()
+
+        if self._path is not None:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sesiones_clave (clave, token, exp) VALUES (?, ?, ?)",
+                    (clave, token, int(exp)),
+                )
+
+    def get(self, clave: str) -> str | None:
+        """Token vigente de la clave, o None."""
+        if not clave:
+            return None
+
+        with self._lock:
+            entrada = self._memoria.get(clave)
+
+        if entrada is None and self._path is not None:
+            with self._connect() as conn:
+                entrada = conn.execute(
+                    "SELECT token, exp FROM sesiones_clave WHERE clave = ?", (clave,)
+                ).fetchone()
+            if entrada is not None:
+                with self._lock:
+                    self._memoria[clave] = tuple(entrada)
+
+        if entrada is None:
+            return None
+
+        token, exp = entrada
+        if exp <= time.time():
+            self.delete(clave)
+            return None
+        return token
+
+    def delete(self, clave: str) -> None:
+        with self._lock:
+            self._memoria.pop(clave, None)
+
+        if self._path is not None:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM sesiones_clave WHERE clave = ? OR exp <= ?", (clave, int(time.time())))
+
+    def _purgar(self) -> None:
+        ahora = time.time()
+        for clave in [c for c, (_, exp) in self._memoria.items() if exp <= ahora]:
+            del self._memoria[clave]
+
+_store: SessionStore | None = None
+_store_lock = threading.Lock()
+
+def get_session_store() -> SessionStore | None:
+    """Almacén configurado en [auth] session_store, o None si está desactivado."""
+    global _store
+
+    modo = str(auth_config.SESSION_STORE).lower()
+    if modo not in ("memory", "sqlite"):
+        return None
+
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = SessionStore(auth_config.SESSION_STORE_PATH if modo == "sqlite" else None)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Sesiones en SQLite no disponibles, se usa memoria: {e}")
+                _store = SessionStore()
+        return _store
@@ -0,0 +1,46 @@
+import threading
+from collections import defaultdict
+from typing import Callable
+
+# ============================================================
+#  🔹 EVENTOS DE ESCRITURA (publicación / suscripción en proceso)
+# ============================================================
+#
+# Las funciones de escritura publican un evento DESPUÉS del commit; las
+# estructuras derivadas (KPIs, resúmenes) se suscriben para actualizarse
+# sin recalcular el histórico completo.
+#
+# Eventos:
+#   - "isak_guardado":  id_isak, usuario
+#   - "isak_eliminado": ids_isak (lista) o id_jugadora
+
+_subscribers: dict[str, list[Callable]] = defaultdict(list)
+_version = 0
+_lock = threading.Lock()
+
+def subscribe(evento: str, callback: Callable) -> None:
+    """Registra `callback(**payload)` para el evento (una sola vez)."""
+    with _lock:
+        if callback not in _subscribers[evento]:
+            _subscribers[evento].append(callback)
+
+def publish(evento: str, **payload) -> None:
+    """
+    Notifica el evento a sus suscriptores. Un suscriptor que falla no
+    afecta a la escritura (ya confirmada) ni al resto de suscriptores.
+    """
+    global _version
+
+    with _lock:
+        _version += 1
+        callbacks = list(_subscribers.get(evento, ()))
+
+    for callback in callbacks:
+        try:
+            callback(**payload)
+        except Exception as e:
+            print(f"Error en suscriptor de '{evento}': {e}")
+
+def data_version() -> int:
+    """Contador que aumenta con cada escritura publicada en este proceso."""
+    return _version
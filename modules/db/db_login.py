@@ -1,13 +1,163 @@
+import threading
+import time
+
 import pandas as pd
-import streamlit as st
+from modules.auth_system.auth_config import RBAC_TTL
 from modules.db.db_client import query
+from modules.db.db_connection import get_connection
+from modules.util.budget_cache import budget_cache
+
+# ============================================================
+#  🔹 CACHÉ RBAC (roles → permisos, usuarios → rol / estado)
+# ============================================================
+#
+# Dos consultas pequeñas (roles con sus permisos y usuarios con su rol y
+# estado) evitan el JOIN con GROUP_CONCAT en cada login y permiten
+# comprobar permisos en memoria. Se recarga pasado RBAC_TTL o al llamar a
+# invalidate_rbac() (p. ej. tras modificar usuarios o roles).
+#
+# Los hashes de contraseña NO se cachean: la tabla users es compartida con
+# otras apps y un cambio de contraseña debe valer desde el primer login.
+# load_user_from_db los lee con una consulta de una fila.
+
+class RBACSnapshot:
+    def __init__(self, roles: dict[str, frozenset], users: dict[str, dict]):
+        self.roles = roles
+        self.users = users
+        self.creado = time.monotonic()
+
+    def user(self, email: str) -> dict | None:
+        """Datos de usuario, rol y permisos (sin password_hash), o None."""
+        user = self.users.get(str(email).strip().lower())
+        if user is None:
+            return None
+
+        permisos = self.roles.get(user["role_name"])
+        if not permisos:
+            # Igual que el INNER JOIN con role_permissions
+            return None
+
+        return {
+            **user,
+            "permissions": ", ".join(sorted(permisos)),
+            "permission_set": permisos,
+        }
+
+    def has_permission(self, email: str, permiso: str) -> bool:
+        user = self.users.get(str(email).strip().lower())
+        return user is not None and permiso in self.roles.get(user["role_name"], ())
+
+_rbac: RBACSnapshot | None = None
+_rbac_lock = threading.Lock()
+
+def _load_rbac() -> RBACSnapshot | None:
+    permisos = query("""
+        SELECT r.name AS role_name, p.name AS permission
+        FROM roles r
+        INNER JOIN role_permissions rp ON r.id = rp.role_id
+        INNER JOIN permissions p ON rp.permission_id = p.id;
+    """)
+    usuarios = query("""
+        SELECT
+            u.id, u.email, u.name, u.lastname,
+            r.name AS role_name,
+            s.name AS state_name
+        FROM users u
+        INNER JOIN roles r ON u.role_id = r.id
+        INNER JOIN state_user s ON u.state_id = s.id;
+    """)
+    if permisos is None or usuarios is None:
+        return None
+
+    roles: dict[str, set] = {}
+    for fila in permisos:
+        roles.setdefault(fila["role_name"], set()).add(fila["permission"])
+
+    return RBACSnapshot(
+        roles={rol: frozenset(p) for rol, p in roles.items()},
+        users={str(u["email"]).strip().lower(): u for u in usuarios},
+    )
+
+def get_rbac(force: bool = False) -> RBACSnapshot | None:
+    """Snapshot RBAC vigente (recargado si superó RBAC_TTL)."""
+    global _rbac
+
+    actual = _rbac
+    if not force and actual is not None and time.monotonic() - actual.creado < RBAC_TTL:
+        return actual
+
+    with _rbac_lock:
+        if not force and _rbac is not None and time.monotonic() - _rbac.creado < RBAC_TTL:
+            return _rbac
+
+        nuevo = _load_rbac()
+        if nuevo is not None:
+            _rbac = nuevo
+        return _rbac
+
+def invalidate_rbac() -> None:
+    """Fuerza la recarga de roles y usuarios en la próxima consulta."""
+    global _rbac
+    with _rbac_lock:
+        _rbac = None
+
+def has_permission(email: str, permiso: str) -> bool:
+    rbac = get_rbac()
+    return rbac is not None and rbac.has_permission(email, permiso)
 
 def load_user_from_db(email: str):
     """
-    Obtiene un usuario desde la base de datos según su email.
+    Obtiene un usuario según su email: hash de contraseña desde la base de
+    datos (una fila) y rol / permisos desde la caché RBAC.
     Retorna un dict con los datos del usuario o None si no existe.
     """
+    credencial = query(
+        "SELECT password_hash FROM users WHERE email = %s LIMIT 1;",
+        (email,),
+        fetch="one",
+    )
+    if not credencial:
+        return None
+
+    rbac = get_rbac()
+    if rbac is None:
+        return _query_user(email)
+
+    # Alta reciente (aún no está en la caché): se recarga una vez
+    if str(email).strip().lower() not in rbac.users:
+        rbac = get_rbac(force=True) or rbac
+
+    user = rbac.user(email)
+    if user is None:
+        return None
+
+    return {**user, "password_hash": credencial["password_hash"]}
+
+def update_password_hash(user_id: int, password_hash: str) -> bool:
+    """Sustituye el hash de contraseña del usuario (rehash al iniciar sesión)."""
+    conn = get_connection()
+    if conn is None:
+        return False
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            "UPDATE users SET password_hash = %s WHERE id = %s;",
+            (password_hash, user_id),
+        )
+        conn.commit()
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error actualizando hash de contraseña: {e}")
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
 
+def _query_user(email: str):
     sql = """
     SELECT 
         u.id,
@@ -61,6 +211,6 @@ def _load_all_users():
     return pd.DataFrame(rows or [])
 
 # Esta SÍ se puede cachear sin problemas
-@st.cache_data(ttl=3600, show_spinner=False)
+@budget_cache(ttl=3600, copy=True)
 def load_all_users_from_db():
     return _load_all_users()
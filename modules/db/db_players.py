@@ -1,9 +1,9 @@
 import pandas as pd
-import streamlit as st
 from modules.db.db_client import query
 from modules.schema import MAP_POSICIONES
+from modules.util.budget_cache import budget_cache
 
-@st.cache_data(ttl=36000, show_spinner=False)
+@budget_cache(ttl=36000, copy=True)
 def load_players_db() -> pd.DataFrame | None:
     """
     Carga jugadoras desde la base de datos (futbolistas + informacion_futbolistas).
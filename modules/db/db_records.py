@@ -1,15 +1,89 @@
+import datetime
+
 import streamlit as st
 import pandas as pd
 
 from modules.db.db_client import query
 from modules.db.db_connection import get_connection
+from modules.db.db_events import publish
 from modules.schema import new_base_record
+from modules.util.budget_cache import budget_cache
+from modules.util.isak_snapshot import invalidate_snapshots
 
-def get_records_db(as_df: bool = True):
+def get_records_scope() -> str:
+    """
+    Ámbito de registros visible para el rol actual:
+    - "developer": solo registros generados por el usuario developer
+    - "staff": el resto
+    """
+    rol = st.session_state.get("auth", {}).get("rol", "").lower()
+    return "developer" if rol == "developer" else "staff"
+
+def _isak_where_sql(
+    scope: str,
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+    start=None,
+    end=None,
+    id_isak: int | None = None,
+) -> tuple[str, tuple | None]:
+    """
+    WHERE común de las consultas ISAK (alias `i` = sesión, `f` = futbolista).
+    Los predicados opcionales se añaden como parámetros de la consulta.
+    `end` es inclusivo: se compara contra el día siguiente para no perder
+    las mediciones con hora.
+    """
+    condiciones = [
+        "f.genero = 'F'",
+        "f.id_estado = 1",
+        "i.estatus_id IN (1, 2)",
+        _usuario_scope_sql(scope),
+    ]
+    params = []
+
+    if plantel:
+        condiciones.append("f.competicion = %s")
+        params.append(plantel)
+
+    if id_jugadora:
+        condiciones.append("i.id_jugadora = %s")
+        params.append(id_jugadora)
+
+    if start:
+        condiciones.append("i.fecha_medicion >= %s")
+        params.append(start)
+
+    if end:
+        condiciones.append("i.fecha_medicion < %s")
+        params.append(end + datetime.timedelta(days=1))
+
+    if id_isak:
+        condiciones.append("i.id_isak = %s")
+        params.append(id_isak)
+
+    return "WHERE " + "\n          AND ".join(condiciones), tuple(params) or None
+
+def _usuario_scope_sql(scope: str) -> str:
+    return "i.usuario = 'developer'" if scope == "developer" else "i.usuario <> 'developer'"
+
+def get_records_db(
+    as_df: bool = True,
+    scope: str | None = None,
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+    start=None,
+    end=None,
+):
     """
     Devuelve sesiones ISAK (COMPLETO) por jugadora.
+    `scope` permite cargar sin sesión de Streamlit (hilos en segundo plano);
+    por defecto se deduce del rol actual.
+    `plantel`, `id_jugadora`, `start` y `end` filtran directamente en SQL.
     """
-    sql = """
+    scope = scope or get_records_scope()
+    where, params = _isak_where_sql(scope, plantel, id_jugadora, start, end)
+
+    sql = f"""
         SELECT
             i.id_isak,
             i.id_jugadora AS identificacion,
@@ -27,26 +101,26 @@ def get_records_db(as_df: bool = True):
         INNER JOIN futbolistas f
             ON i.id_jugadora = f.identificacion
 
-        WHERE f.genero = 'F'
-          AND f.id_estado = 1
-          AND i.estatus_id IN (1, 2)
+        {where}
 
         ORDER BY i.fecha_medicion DESC;
     """
 
-    rows = query(sql)
+    rows = query(sql, params)
     if not rows:
         return pd.DataFrame() if as_df else []
 
+    df = _records_to_df(rows)
+    return df if as_df else df.to_dict("records")
+
+def _records_to_df(rows: list[dict]) -> pd.DataFrame:
+    """
+    Normaliza las filas de cabecera ISAK: fechas y nombre completo de la
+    jugadora. El ámbito (developer / staff) ya viene filtrado en SQL.
+    """
     df = pd.DataFrame(rows)
     df["fecha_medicion"] = pd.to_datetime(df["fecha_medicion"], errors="coerce")
 
-    rol = st.session_state["auth"]["rol"].lower()
-    if rol == "developer":
-        df = df[df["usuario"] == "developer"]
-    else:
-        df = df[df["usuario"] != "developer"]
-
     #st.dataframe(df)
     df.insert(
         2,
@@ -55,97 +129,7 @@ def get_records_db(as_df: bool = True):
     )
 
     df.drop(columns=["nombre", "apellido"], inplace=True, errors="ignore")
-    return df if as_df else df.to_dict("records")
-
-def get_isak_basicos(id_isak: int) -> dict | None:
-    sql = """
-        SELECT
-            peso_bruto_kg,
-            talla_corporal_cm,
-            talla_sentado_cm,
-            envergadura_cm
-        FROM antropometria_isak_basicos
-        WHERE id_isak = %s;
-    """
-    rows = query(sql, (id_isak,))
-    return rows[0] if rows else None
-
-def get_isak_perimetros(id_isak: int) -> dict | None:
-    sql = """
-        SELECT
-            per_cabeza_cm                AS perimetro_cabeza,
-            per_cuello_cm                AS perimetro_cuello,
-            per_brazo_relajado_cm        AS perimetro_brazo_relajado,
-            per_brazo_flexionado_tension_cm AS perimetro_brazo_flexionado_en_tension,
-            per_antebrazo_maximo_cm      AS perimetro_antebrazo_maximo,
-            per_muneca_cm                AS perimetro_muneca,
-            per_torax_mesoesternal_cm    AS perimetro_torax_mesoesternal,
-            per_cintura_minima_cm        AS perimetro_cintura_minima,
-            per_abdominal_maxima_cm      AS perimetro_abdominal_maxima,
-            per_cadera_maxima_cm         AS perimetro_cadera_maximo,
-            per_muslo_maximo_cm          AS perimetro_muslo_maximo,
-            per_muslo_medial_cm          AS perimetro_muslo_medial,
-            per_pantorrilla_maxima_cm    AS perimetro_pantorrilla_maxima,
-            per_tobillo_minima_cm        AS perimetro_tobillo_minima
-        FROM antropometria_isak_perimetros
-        WHERE id_isak = %s;
-    """
-    rows = query(sql, (id_isak,))
-    return rows[0] if rows else None
-
-def get_isak_pliegues(id_isak: int) -> dict | None:
-    sql = """
-        SELECT
-            pl_triceps_mm         AS pliegue_triceps,
-            pl_subescapular_mm    AS pliegue_subescapular,
-            pl_biceps_mm          AS pliegue_biceps,
-            pl_cresta_iliaca_mm   AS pliegue_cresta_iliaca,
-            pl_supraespinal_mm    AS pliegue_supraespinal,
-            pl_abdominal_mm       AS pliegue_abdominal,
-            pl_muslo_frontal_mm   AS pliegue_muslo_frontal,
-            pl_pantorrilla_maxima_mm AS pliegue_pantorrilla_maxima,
-            pl_antebrazo_mm       AS pliegue_antebrazo
-        FROM antropometria_isak_pliegues
-        WHERE id_isak = %s;
-    """
-    rows = query(sql, (id_isak,))
-    return rows[0] if rows else None
-
-def get_isak_longitudes(id_isak: int) -> dict | None:
-    sql = """
-        SELECT
-            len_acromial_radial_cm                AS acromial_radial,
-            len_radial_estiloidea_cm              AS radial_estiloidea,
-            len_medial_estiloidea_dactilar_cm     AS medial_estiloidea_dactilar,
-            len_ilioespinal_cm                    AS ilioespinal,
-            len_trocanterea_cm                    AS trocanterea,
-            len_troc_tibial_lateral_cm            AS troc_tibial_lateral,
-            len_tibial_lateral_cm                 AS tibial_lateral,
-            len_tibial_medial_maleolar_medial_cm  AS tibial_medial_maleolar_medial,
-            len_pie_cm                            AS pie
-        FROM antropometria_isak_longitudes
-        WHERE id_isak = %s;
-    """
-    rows = query(sql, (id_isak,))
-    return rows[0] if rows else None
-
-def get_isak_diametros(id_isak: int) -> dict | None:
-    sql = """
-        SELECT
-            diam_biacromial_cm                AS biacromial,
-            diam_torax_transverso_cm          AS torax_transverso,
-            diam_torax_anteroposterior_cm     AS torax_antero_posterior,
-            diam_biiliocrestideo_cm           AS bi_iliocrestideo,
-            diam_humeral_biepicondilar_cm     AS humeral_biepicondilar,
-            diam_femoral_biepicondilar_cm     AS femoral_biepicondilar,
-            diam_muneca_biestiloideo_cm       AS muneca_biestiloideo,
-            diam_tobillo_bimaleolar_cm        AS tobillo_bimaleolar,
-            diam_mano_cm                      AS mano
-        FROM antropometria_isak_diametros
-        WHERE id_isak = %s;
-    """
-    rows = query(sql, (id_isak,))
-    return rows[0] if rows else None
+    return df
 
 ###############################
 
@@ -376,6 +360,8 @@ def save_isak_session(record: dict) -> bool:
         #insert_isak_calculado(cursor, calculos)
 
         conn.commit()
+        invalidate_snapshots()
+        publish("isak_guardado", id_isak=id_isak, usuario=record["usuario"])
         return True
 
     except Exception as e:
@@ -418,6 +404,8 @@ def delete_records_by_jugadora(id_jugadora: str, deleted_by: str) -> tuple[bool,
             delete_isak_session(cursor, id_isak, deleted_by)
 
         conn.commit()
+        invalidate_snapshots()
+        publish("isak_eliminado", ids_isak=ids_isak)
         return True, f"{len(ids_isak)} registros eliminados correctamente"
 
     except Exception as e:
@@ -445,6 +433,8 @@ def delete_records_by_ids(ids_isak: list[int], deleted_by: str) -> tuple[bool, s
             delete_isak_session(cursor, id_isak, deleted_by)
 
         conn.commit()
+        invalidate_snapshots()
+        publish("isak_eliminado", ids_isak=ids_isak)
         return True, f"{len(ids_isak)} registros eliminados correctamente"
 
     except Exception as e:
@@ -489,59 +479,170 @@ def delete_isak_session(cursor, id_isak: int, deleted_by: str):
 
 #########################
 
-@st.cache_data(ttl=36000, show_spinner=False)
-def build_record_from_isak(id_isak: int, id_jugadora: str, username: str) -> dict:
-    record = new_base_record(id_jugadora=id_jugadora, username=username)
-    record["_modo"] = "SEGUIMIENTO"
+# Columnas RAW y JOINs para leer una sesión completa en una sola consulta
+_ISAK_RAW_SELECT = """
+            b.peso_bruto_kg,
+            b.talla_corporal_cm,
+            b.talla_sentado_cm,
+            b.envergadura_cm,
+
+            p.per_cabeza_cm                   AS perimetro_cabeza,
+            p.per_cuello_cm                   AS perimetro_cuello,
+            p.per_brazo_relajado_cm           AS perimetro_brazo_relajado,
+            p.per_brazo_flexionado_tension_cm AS perimetro_brazo_flexionado_en_tension,
+            p.per_antebrazo_maximo_cm         AS perimetro_antebrazo_maximo,
+            p.per_muneca_cm                   AS perimetro_muneca,
+            p.per_torax_mesoesternal_cm       AS perimetro_torax_mesoesternal,
+            p.per_cintura_minima_cm           AS perimetro_cintura_minima,
+            p.per_abdominal_maxima_cm         AS perimetro_abdominal_maxima,
+            p.per_cadera_maxima_cm            AS perimetro_cadera_maximo,
+            p.per_muslo_maximo_cm             AS perimetro_muslo_maximo,
+            p.per_muslo_medial_cm             AS perimetro_muslo_medial,
+            p.per_pantorrilla_maxima_cm       AS perimetro_pantorrilla_maxima,
+            p.per_tobillo_minima_cm           AS perimetro_tobillo_minima,
+
+            pl.pl_triceps_mm            AS pliegue_triceps,
+            pl.pl_subescapular_mm       AS pliegue_subescapular,
+            pl.pl_biceps_mm             AS pliegue_biceps,
+            pl.pl_cresta_iliaca_mm      AS pliegue_cresta_iliaca,
+            pl.pl_supraespinal_mm       AS pliegue_supraespinal,
+            pl.pl_abdominal_mm          AS pliegue_abdominal,
+            pl.pl_muslo_frontal_mm      AS pliegue_muslo_frontal,
+            pl.pl_pantorrilla_maxima_mm AS pliegue_pantorrilla_maxima,
+            pl.pl_antebrazo_mm          AS pliegue_antebrazo,
+
+            l.len_acromial_radial_cm               AS acromial_radial,
+            l.len_radial_estiloidea_cm             AS radial_estiloidea,
+            l.len_medial_estiloidea_dactilar_cm    AS medial_estiloidea_dactilar,
+            l.len_ilioespinal_cm                   AS ilioespinal,
+            l.len_trocanterea_cm                   AS trocanterea,
+            l.len_troc_tibial_lateral_cm           AS troc_tibial_lateral,
+            l.len_tibial_lateral_cm                AS tibial_lateral,
+            l.len_tibial_medial_maleolar_medial_cm AS tibial_medial_maleolar_medial,
+            l.len_pie_cm                           AS pie,
+
+            d.diam_biacromial_cm            AS biacromial,
+            d.diam_torax_transverso_cm      AS torax_transverso,
+            d.diam_torax_anteroposterior_cm AS torax_antero_posterior,
+            d.diam_biiliocrestideo_cm       AS bi_iliocrestideo,
+            d.diam_humeral_biepicondilar_cm AS humeral_biepicondilar,
+            d.diam_femoral_biepicondilar_cm AS femoral_biepicondilar,
+            d.diam_muneca_biestiloideo_cm   AS muneca_biestiloideo,
+            d.diam_tobillo_bimaleolar_cm    AS tobillo_bimaleolar,
+            d.diam_mano_cm                  AS mano
+"""
+
+_ISAK_RAW_JOINS = """
+        LEFT JOIN antropometria_isak_basicos b    ON b.id_isak = i.id_isak
+        LEFT JOIN antropometria_isak_perimetros p ON p.id_isak = i.id_isak
+        LEFT JOIN antropometria_isak_pliegues pl  ON pl.id_isak = i.id_isak
+        LEFT JOIN antropometria_isak_longitudes l ON l.id_isak = i.id_isak
+        LEFT JOIN antropometria_isak_diametros d  ON d.id_isak = i.id_isak
+"""
+
+@budget_cache(ttl=36000, copy=True)
+def get_isak_full(
+    as_df: bool = True,
+    scope: str = "staff",
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+    start=None,
+    end=None,
+):
+    """
+    Devuelve un DataFrame ISAK completo (cabecera + RAW) en una sola
+    consulta. Los predicados se aplican en SQL y forman parte de la clave
+    de caché junto con el `scope` (ver get_records_scope).
+    """
+    df = _query_isak_full(scope, plantel, id_jugadora, start, end)
+    return df if as_df else df.to_dict("records")
 
-    for getter in (
-        get_isak_basicos,
-        get_isak_perimetros,
-        get_isak_pliegues,
-        get_isak_longitudes,
-        get_isak_diametros,
-    ):
-        data = getter(id_isak)
-        if data:
-            record.update(data)
+def get_isak_session_db(id_isak: int, scope: str = "staff", plantel: str | None = None) -> pd.DataFrame:
+    """
+    Una sesión ISAK completa (mismas columnas que get_isak_full), sin caché.
+    Vacío si la sesión no pertenece al ámbito / plantel indicado.
+    """
+    return _query_isak_full(scope, plantel, id_isak=id_isak)
+
+def _query_isak_full(
+    scope: str,
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+    start=None,
+    end=None,
+    id_isak: int | None = None,
+) -> pd.DataFrame:
+    where, params = _isak_where_sql(scope, plantel, id_jugadora, start, end, id_isak)
+
+    sql = f"""
+        SELECT
+            i.id_isak,
+            i.id_jugadora AS identificacion,
+            i.tipo_isak,
+            i.fecha_medicion,
 
-    return record
+            f.nombre,
+            f.apellido,
+            f.competicion AS plantel,
 
-@st.cache_data(ttl=36000, show_spinner=False)
-def get_isak_full(as_df: bool = True):
-    """
-    Devuelve un DataFrame ISAK completo usando únicamente
-    las funciones get_isak_* existentes.
+            i.usuario,
+            i.created_at,
+{_ISAK_RAW_SELECT}
+        FROM antropometria_isak i
+        INNER JOIN futbolistas f
+            ON i.id_jugadora = f.identificacion
+{_ISAK_RAW_JOINS}
+        {where}
+
+        ORDER BY i.fecha_medicion DESC;
     """
 
-    base_df = get_records_db(as_df=True)
-    
-    if base_df.empty:
-        return base_df if as_df else []
+    rows = query(sql, params)
+    if not rows:
+        return pd.DataFrame()
 
-    rows = []
+    return _records_to_df(rows)
 
-    for _, row in base_df.iterrows():
-        id_isak = row["id_isak"]
+@budget_cache(ttl=36000, copy=True, invalidate_on=("isak_guardado", "isak_eliminado"))
+def get_baseline_isak_db(id_jugadora: str, scope: str = "staff") -> dict | None:
+    """
+    Última sesión ISAK COMPLETO de la jugadora con todos sus valores RAW
+    (una sola consulta). None si la jugadora no tiene sesión base.
+    """
+    # Mismo WHERE que el resto de lecturas ISAK: solo jugadoras activas
+    # de la plantilla
+    where, params = _isak_where_sql(scope, id_jugadora=id_jugadora)
+
+    sql = f"""
+        SELECT
+            i.id_isak,
+            i.tipo_isak,
+            i.fecha_medicion,
+{_ISAK_RAW_SELECT}
+        FROM antropometria_isak i
+        INNER JOIN futbolistas f
+            ON i.id_jugadora = f.identificacion
+{_ISAK_RAW_JOINS}
+        {where}
+          AND i.tipo_isak = 'COMPLETO'
 
-        data = row.to_dict()
+        ORDER BY i.fecha_medicion DESC
+        LIMIT 1;
+    """
+    rows = query(sql, params)
+    return rows[0] if rows else None
 
-        # ---------------------------
-        # Enriquecer con ISAK
-        # ---------------------------
-        for getter in (
-            get_isak_basicos,
-            get_isak_perimetros,
-            get_isak_pliegues,
-            get_isak_longitudes,
-            get_isak_diametros,
-        ):
-            values = getter(id_isak)
-            if values:
-                data.update(values)
+def build_record_from_baseline(baseline: dict, id_jugadora: str, username: str) -> dict:
+    """
+    Registro de SEGUIMIENTO precargado con los valores RAW de la fila
+    devuelta por get_baseline_isak_db (sin consultas adicionales).
+    """
+    record = new_base_record(id_jugadora=id_jugadora, username=username)
+    record["_modo"] = "SEGUIMIENTO"
 
-        rows.append(data)
+    record.update({
+        k: v for k, v in baseline.items()
+        if k not in ("id_isak", "tipo_isak", "fecha_medicion")
+    })
 
-    df = pd.DataFrame(rows)
-    
-    return df if as_df else df.to_dict("records")
+    return record
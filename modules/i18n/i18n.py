@@ -1,18 +1,96 @@
 import json
-import streamlit as st
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
+
+import streamlit as st
 
 _LANG_DIR = Path(__file__).parent / "lang"
 
-#@st.cache_resource(show_spinner=False)
-def _load_lang(lang: str) -> dict:
-    """Carga el archivo de idioma (lang/en.json, lang/pt.json, etc.)."""
+# ============================================================
+#  🔹 CATÁLOGO DE TRADUCCIONES (una carga por idioma y proceso)
+# ============================================================
+#
+# Cada idioma se lee una vez y se comparte entre sesiones como mapping de
+# solo lectura. Como mucho cada _RELOAD_CHECK_S segundos se comprueba el
+# mtime del archivo y, si cambió, se vuelve a cargar (editar un .json no
+# exige reiniciar la app).
+
+_RELOAD_CHECK_S = 5.0
+
+class _LangCatalog:
+    def __init__(self):
+        # lang -> (mtime, datos, momento de la última comprobación)
+        self._langs: dict[str, tuple[float | None, MappingProxyType, float]] = {}
+        # (lang, etiquetas) -> etiquetas traducidas (ver translate_labels)
+        self._labels: dict[tuple, MappingProxyType] = {}
+        self._lock = threading.Lock()
+
+    def get(self, lang: str) -> MappingProxyType:
+        ahora = time.monotonic()
+        actual = self._langs.get(lang)
+        if actual is not None and ahora - actual[2] < _RELOAD_CHECK_S:
+            return actual[1]
+
+        with self._lock:
+            actual = self._langs.get(lang)
+            if actual is not None and ahora - actual[2] < _RELOAD_CHECK_S:
+                return actual[1]
+
+            mtime = _mtime(lang)
+            if actual is not None and actual[0] == mtime:
+                datos = actual[1]
+            else:
+                datos = MappingProxyType(_read_lang(lang))
+                for clave in [k for k in self._labels if k[0] == lang]:
+                    del self._labels[clave]
+
+            self._langs[lang] = (mtime, datos, ahora)
+            return datos
+
+    def labels(self, lang: str, items: tuple) -> MappingProxyType:
+        clave = (lang, items)
+        traducidas = self._labels.get(clave)
+        if traducidas is not None:
+            return traducidas
+
+        # get() toma el lock: se llama antes de entrar
+        datos = self.get(lang) if lang != "es" else {}
+
+        with self._lock:
+            traducidas = self._labels.get(clave)
+            if traducidas is None:
+                traducidas = MappingProxyType({k: datos.get(v, v) for k, v in items})
+                # No se guarda si el idioma se recargó mientras tanto
+                if lang == "es" or self._langs.get(lang, (None, None))[1] is datos:
+                    self._labels[clave] = traducidas
+            return traducidas
+
+    def clear(self) -> None:
+        with self._lock:
+            self._langs.clear()
+            self._labels.clear()
+
+_catalog = _LangCatalog()
+
+def _mtime(lang: str) -> float | None:
+    try:
+        return (_LANG_DIR / f"{lang}.json").stat().st_mtime
+    except OSError:
+        return None
+
+def _read_lang(lang: str) -> dict:
     path = _LANG_DIR / f"{lang}.json"
     if not path.exists():
         return {}
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _load_lang(lang: str) -> MappingProxyType:
+    """Traducciones del idioma (lang/en.json, lang/pt.json, etc.), desde el catálogo."""
+    return _catalog.get(lang)
+
 def t(text: str) -> str:
     """
     Devuelve la traducción del texto original según el idioma activo.
@@ -24,9 +102,58 @@ def t(text: str) -> str:
     if lang == "es":
         return text
 
-    data = _load_lang(lang)
-    #st.text(f"Idioma seleccionado: {lang}")
-    return data.get(text, text)
+    return _load_lang(lang).get(text, text)
+
+# ============================================================
+#  🔹 TEXTOS PEREZOSOS (etiquetas a nivel de módulo)
+# ============================================================
+#
+# Las constantes de módulo no pueden llamar a t(): se traducirían al
+# importar y quedarían fijas en el idioma de la primera sesión. LazyT
+# guarda el texto original y se traduce al usarse (str, f-string, +).
+
+class LazyT:
+    """Texto traducible que se resuelve con el idioma activo al renderizar."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __str__(self) -> str:
+        return t(self.text)
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+    def __repr__(self) -> str:
+        return f"LazyT({self.text!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyT):
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __add__(self, other) -> str:
+        return str(self) + str(other)
+
+    def __radd__(self, other) -> str:
+        return str(other) + str(self)
+
+def translate_labels(labels: dict) -> MappingProxyType:
+    """
+    Traduce de una vez un diccionario clave → etiqueta (str o LazyT) al
+    idioma activo. El resultado se cachea por idioma y contenido, así que
+    llamarlo en cada render cuesta una búsqueda.
+    """
+    lang = st.session_state.get("lang", "es")
+    items = tuple(
+        (k, v.text if isinstance(v, LazyT) else v) for k, v in labels.items()
+    )
+    return _catalog.labels(lang, items)
 
 def language_selector(label: str = ":material/language: Idioma / Language", default: str = "es"):
     """Selector de idioma persistente en la barra lateral."""
@@ -0,0 +1,70 @@
+import hashlib
+import json
+from typing import Callable
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from modules.app_config import cache_config
+from modules.util.budget_cache import budget_get, budget_put
+
+# ============================================================
+#  🔹 CACHÉ DE FIGURAS PLOTLY
+# ============================================================
+#
+# Las gráficas se reconstruían en cada rerun aunque el widget que lo
+# provocó no tuviera nada que ver. Aquí se guarda el JSON de cada figura
+# con clave (huella de los datos, idioma, opciones de la gráfica) en el
+# almacén LRU con presupuesto de memoria (budget_cache). En un acierto se
+# devuelve el dict de la figura, que st.plotly_chart acepta directamente:
+# no se vuelve a construir ni a validar el go.Figure.
+
+FIGURE_NS = "figura"
+
+def data_fingerprint(df: pd.DataFrame | None, cols=None) -> str:
+    """Huella del contenido de `df` (columnas `cols`, o todas)."""
+    if df is None or df.empty:
+        return "vacio"
+
+    if cols is not None:
+        df = df[[c for c in cols if c in df.columns]]
+
+    # Hash de filas en orden: reordenar las filas (p. ej. otro orden de
+    # barras) cambia la figura y por tanto la huella
+    filas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(filas.tobytes()).hexdigest()
+    return f"{len(df)}:{'|'.join(map(str, df.columns))}:{digest}"
+
+def _freeze(value):
+    """Opciones → estructura hashable para la clave."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, set) else items)
+    return value
+
+def cached_figure(
+    nombre: str,
+    build: Callable[[], go.Figure],
+    df: pd.DataFrame | None = None,
+    cols=None,
+    **opciones,
+) -> dict:
+    """
+    Figura `nombre` para los datos `df` y las `opciones` dadas, como dict
+    listo para st.plotly_chart. `build()` solo se llama si no está en caché.
+    """
+    key = (
+        data_fingerprint(df, cols),
+        st.session_state.get("lang", "es"),
+        _freeze(opciones),
+    )
+
+    encontrado, spec = budget_get(f"{FIGURE_NS}:{nombre}", key)
+    if not encontrado:
+        spec = build().to_json()
+        budget_put(f"{FIGURE_NS}:{nombre}", key, spec, ttl=cache_config.FIGURE_CACHE_TTL)
+
+    return json.loads(spec)
@@ -1,22 +1,25 @@
 # src/plots_grupales.py
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from modules.i18n.i18n import t
+from modules.i18n.i18n import LazyT, t, translate_labels
+from modules.reports.figure_cache import cached_figure
 from modules.util.records_util import filter_last_record_per_player
+from modules.util.isak_cube import get_cube
 from modules.util.util import _title
 
 REQUIRED = {"suma_6_pliegues_mm", "idx_musculo_oseo", "nombre_jugadora"}
 
 METRICAS_DISTRIBUCION = {
-    "peso_bruto_kg": t("Peso (kg)"),
-    "talla_corporal_cm": t("Talla (cm)"),
-    "suma_6_pliegues_mm": t("Suma 6 pliegues (mm)"),
-    "ajuste_adiposa_pct": t("% Grasa"),
-    "ajuste_muscular_pct": t("% Muscular"),
-    "masa_osea_kg": t("Masa ósea (kg)"),
-    "idx_musculo_oseo": t("Índice músculo-óseo"),
+    "peso_bruto_kg": LazyT("Peso (kg)"),
+    "talla_corporal_cm": LazyT("Talla (cm)"),
+    "suma_6_pliegues_mm": LazyT("Suma 6 pliegues (mm)"),
+    "ajuste_adiposa_pct": LazyT("% Grasa"),
+    "ajuste_muscular_pct": LazyT("% Muscular"),
+    "masa_osea_kg": LazyT("Masa ósea (kg)"),
+    "idx_musculo_oseo": LazyT("Índice músculo-óseo"),
 }
 
 # -------------------------
@@ -43,14 +46,52 @@ Y_MIN, Y_MAX = 3.2, 4.5
 # -------------------------
 # ASIGNACIÓN DE CUADRANTE Y COLOR
 # -------------------------
+CUADRANTES = {
+    "G1": "#2ECC71",  # verde
+    "G2": "#F1C40F",  # amarillo
+    "G3": "#F39C12",  # naranja
+    "G4": "#E74C3C",  # rojo
+}
+
+def clasificar_cuadrantes(df: pd.DataFrame, x: str = "x", y: str = "y") -> pd.DataFrame:
+    """
+    Añade `grupo` (G1-G4) y `color` según X_CORTE / Y_CORTE, en bloque
+    (mismo resultado que `cuadrante` fila a fila; valores vacíos → G4).
+    """
+    xs = pd.to_numeric(df[x], errors="coerce").to_numpy(dtype=float)
+    ys = pd.to_numeric(df[y], errors="coerce").to_numpy(dtype=float)
+
+    # Comparaciones explícitas (no ~): con NaN todas son falsas → G4
+    izquierda, derecha = xs <= X_CORTE, xs > X_CORTE
+    arriba, abajo = ys >= Y_CORTE, ys < Y_CORTE
+
+    condiciones = [izquierda & arriba, derecha & arriba, izquierda & abajo]
+    grupos = list(CUADRANTES)
+
+    return df.assign(
+        grupo=np.select(condiciones, grupos[:3], default=grupos[3]),
+        color=np.select(condiciones, [CUADRANTES[g] for g in grupos[:3]], default=CUADRANTES["G4"]),
+    )
+
+def etiquetas_perfil(df: pd.DataFrame, x: str = "x", y: str = "y") -> pd.Series:
+    """Etiqueta 'Nombre (x; y)' de cada jugadora, con operaciones de texto en bloque."""
+    xs = np.char.mod("%.1f", pd.to_numeric(df[x], errors="coerce").to_numpy(dtype=float))
+    ys = np.char.mod("%.2f", pd.to_numeric(df[y], errors="coerce").to_numpy(dtype=float))
+
+    return (
+        df["nombre_jugadora"].astype(str).str.title()
+        + " (" + pd.Series(xs, index=df.index) + "; " + pd.Series(ys, index=df.index) + ")"
+    )
+
 def cuadrante(row):
+    """Cuadrante y color de una fila (para lotes usar clasificar_cuadrantes)."""
     if row["x"] <= X_CORTE and row["y"] >= Y_CORTE:
-        return "G1", "#2ECC71"  # verde
+        return "G1", CUADRANTES["G1"]
     if row["x"] > X_CORTE and row["y"] >= Y_CORTE:
-        return "G2", "#F1C40F"  # amarillo
+        return "G2", CUADRANTES["G2"]
     if row["x"] <= X_CORTE and row["y"] < Y_CORTE:
-        return "G3", "#F39C12"  # naranja
-    return "G4", "#E74C3C"      # rojo
+        return "G3", CUADRANTES["G3"]
+    return "G4", CUADRANTES["G4"]
 
 # -------------------------
 # DETECCIÓN DE SOLAPAMIENTO
@@ -68,7 +109,7 @@ def plot_distribuciones(df: pd.DataFrame):
     )
 
     metricas = {
-        k: v for k, v in METRICAS_DISTRIBUCION.items()
+        k: v for k, v in translate_labels(METRICAS_DISTRIBUCION).items()
         if k in df.columns and df[k].dropna().any()
     }
 
@@ -103,40 +144,46 @@ def plot_distribuciones(df: pd.DataFrame):
     # -------------------------
     # Gráfico
     # -------------------------
-    fig = go.Figure()
-
-    fig.add_trace(go.Bar(
-        x=data["nombre_jugadora"],
-        y=valores,
-        text=valores.map(lambda x: f"{x:.1f}"),
-        textposition="outside",
-        marker_color="#4A6FBF",
-    ))
-
-    # Línea de promedio
-    fig.add_hline(
-        y=media,
-        line_dash="dash",
-        line_color="#27AE60",
-        annotation_text=t("Promedio"),
-        annotation_position="top left",
-    )
+    def _figura():
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=data["nombre_jugadora"],
+            y=valores,
+            text=valores.map(lambda x: f"{x:.1f}"),
+            textposition="outside",
+            marker_color="#4A6FBF",
+        ))
+
+        # Línea de promedio
+        fig.add_hline(
+            y=media,
+            line_dash="dash",
+            line_color="#27AE60",
+            annotation_text=t("Promedio"),
+            annotation_position="top left",
+        )
 
-    fig.update_layout(
-        template="plotly_white",
-        xaxis_title="",
-        yaxis_title=metricas[col],
-        height=450,
-        margin=dict(t=60, b=120),
-        showlegend=False,
-    )
+        fig.update_layout(
+            template="plotly_white",
+            xaxis_title="",
+            yaxis_title=metricas[col],
+            height=450,
+            margin=dict(t=60, b=120),
+            showlegend=False,
+        )
 
-    fig.update_xaxes(
-        tickangle=-45,
-        tickfont=dict(size=10),
-    )
+        fig.update_xaxes(
+            tickangle=-45,
+            tickfont=dict(size=10),
+        )
 
-    st.plotly_chart(fig, use_container_width=True)
+        return fig
+
+    st.plotly_chart(
+        cached_figure("distribucion", _figura, data, col=col),
+        use_container_width=True,
+    )
 
     # -------------------------
     # Resumen textual (como PDF)
@@ -203,43 +250,49 @@ def plot_comparacion_mediciones(df: pd.DataFrame):
         lambda x: "#2ECC71" if x > 0 else "#E74C3C"
     )
 
-    y_min = delta_df["delta_pct"].min()
-    y_max = delta_df["delta_pct"].max()
+    def _figura():
+        y_min = delta_df["delta_pct"].min()
+        y_max = delta_df["delta_pct"].max()
+
+        padding = max(abs(y_min), abs(y_max)) * 0.15  # 15% de margen
+        # -------------------------
+        # GRÁFICO
+        # -------------------------
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=delta_df["variable"],
+            y=delta_df["delta_pct"],
+            marker_color=delta_df["color"],
+            text=delta_df["delta_pct"].map(lambda x: f"{x:+.2f}%"),
+            textposition="outside",
+        textfont=dict(size=12, color="#2C3E50"),
+        ))
+
+        fig.update_layout(
+            uniformtext=dict(
+            minsize=10,
+            mode="show"),
+            yaxis=dict(
+                title=t("Cambio (%) respecto a la 1ª medición"),
+                range=[y_min - padding, y_max + padding],
+                zeroline=True,
+                zerolinewidth=2,
+                zerolinecolor="#BDC3C7",
+            ),
+            #title=t("Variación porcentual entre mediciones"),
+            yaxis_title=t("Cambio (%) respecto a la 1ª medición"),
+            xaxis_title="",
+            template="plotly_white",
+            showlegend=False,
+        )
 
-    padding = max(abs(y_min), abs(y_max)) * 0.15  # 15% de margen
-    # -------------------------
-    # GRÁFICO
-    # -------------------------
-    fig = go.Figure()
-
-    fig.add_trace(go.Bar(
-        x=delta_df["variable"],
-        y=delta_df["delta_pct"],
-        marker_color=delta_df["color"],
-        text=delta_df["delta_pct"].map(lambda x: f"{x:+.2f}%"),
-        textposition="outside",
-    textfont=dict(size=12, color="#2C3E50"),
-    ))
-
-    fig.update_layout(
-        uniformtext=dict(
-        minsize=10,
-        mode="show"),
-        yaxis=dict(
-            title=t("Cambio (%) respecto a la 1ª medición"),
-            range=[y_min - padding, y_max + padding],
-            zeroline=True,
-            zerolinewidth=2,
-            zerolinecolor="#BDC3C7",
-        ),
-        #title=t("Variación porcentual entre mediciones"),
-        yaxis_title=t("Cambio (%) respecto a la 1ª medición"),
-        xaxis_title="",
-        template="plotly_white",
-        showlegend=False,
-    )
+        return fig
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        cached_figure("comparacion_mediciones", _figura, delta_df),
+        use_container_width=True,
+    )
 
     # -------------------------
     # TEXTO EXPLICATIVO (INTERPRETACIÓN)
@@ -276,16 +329,35 @@ def plot_comparacion_mediciones(df: pd.DataFrame):
         """
     )
 
+def _resumen_desde_cubo(df: pd.DataFrame, columnas: dict) -> pd.DataFrame | None:
+    """Medias por jugadora leídas del cubo de agregados, si `df` lo lleva."""
+    cube = get_cube(df)
+    if cube is None:
+        return None
+
+    medias = {}
+    for col, metric in columnas.items():
+        stats = cube.player_stats(metric)
+        if stats is None:
+            return None
+        medias[col] = stats["media"]
+
+    return pd.DataFrame(medias).rename_axis("nombre_jugadora").reset_index()
+
 def tabla_resumen(df: pd.DataFrame):
-    resumen = (
-        df.groupby("nombre_jugadora", as_index=False)
-        .agg(
-            peso=("peso_bruto_kg", "mean"),
-            grasa=("ajuste_adiposa_pct", "mean"),
-            pliegues=("ajuste_muscular_pct", "mean"),
-            imo=("idx_musculo_oseo", "mean"),
+    columnas = {
+        "peso": "peso_bruto_kg",
+        "grasa": "ajuste_adiposa_pct",
+        "pliegues": "ajuste_muscular_pct",
+        "imo": "idx_musculo_oseo",
+    }
+
+    resumen = _resumen_desde_cubo(df, columnas)
+    if resumen is None:
+        resumen = (
+            df.groupby("nombre_jugadora", as_index=False)
+            .agg(**{col: (metric, "mean") for col, metric in columnas.items()})
         )
-    )
 
     for col in ["peso", "grasa", "pliegues", "imo"]:
         resumen[col] = resumen[col].map(
@@ -418,23 +490,17 @@ def plot_perfil_antropometrico(df: pd.DataFrame):
     #st.text("Último registro por jugadora:")
     #st.dataframe(df[["identificacion", "nombre_jugadora", "fecha_sesion"]], hide_index=True)
 
-    df = df.copy()
-    df["x"] = pd.to_numeric(df["suma_6_pliegues_mm"], errors="coerce")
-    df["y"] = pd.to_numeric(df["idx_musculo_oseo"], errors="coerce")
-    df = df.dropna(subset=["x", "y"])
+    df = df.assign(
+        x=pd.to_numeric(df["suma_6_pliegues_mm"], errors="coerce"),
+        y=pd.to_numeric(df["idx_musculo_oseo"], errors="coerce"),
+    ).dropna(subset=["x", "y"])
 
     if df.empty:
         st.info(t("No hay valores válidos para el perfil antropométrico."))
         return
 
-    df[["grupo", "color"]] = df.apply(
-        lambda r: pd.Series(cuadrante(r)), axis=1
-    )
-
-    df["label"] = df.apply(
-        lambda r: f'{r["nombre_jugadora"].title()} ({r["x"]:.1f}; {r["y"]:.2f})',
-        axis=1
-    )
+    df = clasificar_cuadrantes(df)
+    df["label"] = etiquetas_perfil(df)
 
     # --------------------------------------------------
     # CONFIGURACIÓN DE ETIQUETAS (UI)
@@ -445,98 +511,108 @@ def plot_perfil_antropometrico(df: pd.DataFrame):
     # --------------------------------------------------
     # FIGURA
     # --------------------------------------------------
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=df["x"],
-        y=df["y"],
-        mode="markers",
-        marker=dict(
-            size=10,
-            color=df["color"],
-            line=dict(width=1, color="white"),
-        ),
-        hovertemplate=(
-            "<b>%{customdata}</b><br>"
-            + t("Suma 6 pliegues") + ": %{x:.1f} mm<br>"
-            + t("Índice músculo/óseo") + ": %{y:.2f}<extra></extra>"
-        ),
-        customdata=df["label"],
-        showlegend=False,
-    ))
+    def _figura():
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatter(
+            x=df["x"],
+            y=df["y"],
+            mode="markers",
+            marker=dict(
+                size=10,
+                color=df["color"],
+                line=dict(width=1, color="white"),
+            ),
+            hovertemplate=(
+                "<b>%{customdata}</b><br>"
+                + t("Suma 6 pliegues") + ": %{x:.1f} mm<br>"
+                + t("Índice músculo/óseo") + ": %{y:.2f}<extra></extra>"
+            ),
+            customdata=df["label"],
+            showlegend=False,
+        ))
+
+        # --------------------------------------------------
+        # ANOTACIONES
+        # --------------------------------------------------
+        offset_index = 0
+
+        for _, row in df_labels.iterrows():
+
+            if needs_arrow(row, df):
+                ax, ay = OFFSET_POSITIONS[offset_index % len(OFFSET_POSITIONS)]
+                offset_index += 1
+
+                fig.add_annotation(
+                    x=row["x"],
+                    y=row["y"],
+                    text=row["label"],
+                    showarrow=True,
+                    arrowhead=2,
+                    arrowwidth=1,
+                    arrowcolor="#424245",
+                    ax=ax,
+                    ay=ay,
+                    font=dict(size=9, color="#424245"),
+                    bgcolor="rgba(255,255,255,0)",
+                    borderpad=2,
+                )
+            else:
+                fig.add_annotation(
+                    x=row["x"],
+                    y=row["y"],
+                    text=row["label"],
+                    showarrow=False,
+                    yshift=10,
+                    font=dict(size=9, color="#374151"),
+                )
 
-    # --------------------------------------------------
-    # ANOTACIONES
-    # --------------------------------------------------
-    offset_index = 0
-
-    for _, row in df_labels.iterrows():
-
-        if needs_arrow(row, df):
-            ax, ay = OFFSET_POSITIONS[offset_index % len(OFFSET_POSITIONS)]
-            offset_index += 1
-
-            fig.add_annotation(
-                x=row["x"],
-                y=row["y"],
-                text=row["label"],
-                showarrow=True,
-                arrowhead=2,
-                arrowwidth=1,
-                arrowcolor="#424245",
-                ax=ax,
-                ay=ay,
-                font=dict(size=9, color="#424245"),
-                bgcolor="rgba(255,255,255,0)",
-                borderpad=2,
-            )
-        else:
-            fig.add_annotation(
-                x=row["x"],
-                y=row["y"],
-                text=row["label"],
-                showarrow=False,
-                yshift=10,
-                font=dict(size=9, color="#374151"),
-            )
+        # --------------------------------------------------
+        # ELEMENTOS FIJOS
+        # --------------------------------------------------
+        fig.add_vline(x=X_CORTE, line_width=1.2, line_color="#9CA3AF")
+        fig.add_hline(y=Y_CORTE, line_width=1.2, line_color="#9CA3AF")
+
+        fig.add_annotation(x=40,  y=4.4, text="<b>G1</b>", showarrow=False)
+        fig.add_annotation(x=115, y=4.4, text="<b>G2</b>", showarrow=False)
+        fig.add_annotation(x=40,  y=3.3, text="<b>G3</b>", showarrow=False)
+        fig.add_annotation(x=115, y=3.3, text="<b>G4</b>", showarrow=False)
+
+        y_min = min(Y_MIN, df["y"].min() - 0.1)
+        y_max = max(Y_MAX, df["y"].max() + 0.1)
+
+        fig.update_layout(
+            title=dict(
+                text=t("Perfil antropométrico grupal"),
+                x=0.02,
+                font=dict(size=18),
+            ),
+            xaxis=dict(
+                title=t("Suma 6 pliegues (mm)"),
+                range=[X_MIN, X_MAX],
+                gridcolor="#ECF0F1",
+            ),
+            yaxis=dict(
+                title=t("Índice músculo / óseo"),
+                range=[y_min, y_max],
+                gridcolor="#ECF0F1",
+            ),
+            template="plotly_white",
+            height=650,
+            margin=dict(l=40, r=40, t=80, b=40),
+        )
 
-    # --------------------------------------------------
-    # ELEMENTOS FIJOS
-    # --------------------------------------------------
-    fig.add_vline(x=X_CORTE, line_width=1.2, line_color="#9CA3AF")
-    fig.add_hline(y=Y_CORTE, line_width=1.2, line_color="#9CA3AF")
-
-    fig.add_annotation(x=40,  y=4.4, text="<b>G1</b>", showarrow=False)
-    fig.add_annotation(x=115, y=4.4, text="<b>G2</b>", showarrow=False)
-    fig.add_annotation(x=40,  y=3.3, text="<b>G3</b>", showarrow=False)
-    fig.add_annotation(x=115, y=3.3, text="<b>G4</b>", showarrow=False)
-
-    y_min = min(Y_MIN, df["y"].min() - 0.1)
-    y_max = max(Y_MAX, df["y"].max() + 0.1)
-
-    fig.update_layout(
-        title=dict(
-            text=t("Perfil antropométrico grupal"),
-            x=0.02,
-            font=dict(size=18),
-        ),
-        xaxis=dict(
-            title=t("Suma 6 pliegues (mm)"),
-            range=[X_MIN, X_MAX],
-            gridcolor="#ECF0F1",
-        ),
-        yaxis=dict(
-            title=t("Índice músculo / óseo"),
-            range=[y_min, y_max],
-            gridcolor="#ECF0F1",
+        return fig
+
+    st.plotly_chart(
+        cached_figure(
+            "perfil_antropometrico", _figura, df,
+            cols=["nombre_jugadora", "x", "y"],
+            cfg_labels=cfg_labels,
         ),
-        template="plotly_white",
-        height=650,
-        margin=dict(l=40, r=40, t=80, b=40),
+        use_container_width=True,
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
     get_interpretacion()
 
 
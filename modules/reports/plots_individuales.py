@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from modules.i18n.i18n import t
+from modules.reports.figure_cache import cached_figure
 
 
 def _fmt(valor, sufijo=""):
@@ -94,13 +95,11 @@ def _get_resumen_tecnico_antropometria(df: pd.DataFrame) -> str:
     )
 
 def _prepare_antropometria_df(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
     # Normalizar fecha → SOLO fecha
-    df["fecha"] = (
+    df = df.assign(fecha=(
         pd.to_datetime(df["fecha_medicion"])
         .dt.normalize()
-    )
+    ))
 
     # 🔧 FORZAR NUMÉRICOS (CLAVE)
     cols_numericas = [
@@ -111,9 +110,10 @@ def _prepare_antropometria_df(df: pd.DataFrame) -> pd.DataFrame:
         "idx_musculo_oseo",
     ]
 
-    for col in cols_numericas:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df.assign(**{
+        col: pd.to_numeric(df[col], errors="coerce")
+        for col in cols_numericas if col in df.columns
+    })
 
     # Orden correcto
     df = df.sort_values("fecha")
@@ -144,119 +144,130 @@ def grafico_peso_grasa(
     df = df.sort_values("fecha")
     df["fecha_label"] = df["fecha"].dt.strftime("%d %b %Y")
 
-    n = len(df)
-    fig = go.Figure()
-
-    # -------------------------
-    # RANGO DINÁMICO PESO
-    # -------------------------
-    peso_min = df["peso_bruto_kg"].min()
-    peso_max = df["peso_bruto_kg"].max()
-
-    # Margen adaptativo (antropometría real)
-    rango = peso_max - peso_min
-    margen = max(0.8, rango * 1.5)  # asegura visibilidad incluso con variación mínima
-
-    # -------------------------
-    # PESO → BARRAS
-    # -------------------------
-    fig.add_trace(go.Bar(
-        x=df["fecha_label"],
-        y=df["peso_bruto_kg"],
-        name=t("Peso (kg)"),
-        marker_color="#1F4ED8",
-        opacity=0.85,
-        width=0.6,
-        text=df["peso_bruto_kg"].round(1).astype(str) + " kg",
-        textposition="outside",
-        hovertemplate=(
-            "<b>" + t("Peso") + "</b><br>"
-            + "%{x}<br>"
-            + "%{y:.1f} kg"
-            + "<extra></extra>"
-        )
-    ))
+    def _figura():
+        n = len(df)
+        fig = go.Figure()
+
+        # -------------------------
+        # RANGO DINÁMICO PESO
+        # -------------------------
+        peso_min = df["peso_bruto_kg"].min()
+        peso_max = df["peso_bruto_kg"].max()
+
+        # Margen adaptativo (antropometría real)
+        rango = peso_max - peso_min
+        margen = max(0.8, rango * 1.5)  # asegura visibilidad incluso con variación mínima
+
+        # -------------------------
+        # PESO → BARRAS
+        # -------------------------
+        fig.add_trace(go.Bar(
+            x=df["fecha_label"],
+            y=df["peso_bruto_kg"],
+            name=t("Peso (kg)"),
+            marker_color="#1F4ED8",
+            opacity=0.85,
+            width=0.6,
+            text=df["peso_bruto_kg"].round(1).astype(str) + " kg",
+            textposition="outside",
+            hovertemplate=(
+                "<b>" + t("Peso") + "</b><br>"
+                + "%{x}<br>"
+                + "%{y:.1f} kg"
+                + "<extra></extra>"
+            )
+        ))
+
+        # -------------------------
+        # % GRASA → LÍNEA + PUNTOS
+        # -------------------------
+        fig.add_trace(go.Scatter(
+            x=df["fecha_label"],
+            y=df["ajuste_adiposa_pct"],
+            name=t("% Grasa"),
+            yaxis="y2",
+            mode="lines+markers",
+            line=dict(width=3, color="#E74C3C"),
+            marker=dict(size=10),
+            hovertemplate=(
+                "<b>" + t("% Grasa") + "</b><br>"
+                + "%{x}<br>"
+                + "%{y:.1f} %"
+                + "<extra></extra>"
+            )
+        ))
+
+        # -------------------------
+        # MEDIA EQUIPO (% grasa)
+        # -------------------------
+        if media_equipo_grasa is not None:
+            fig.add_hline(
+                y=media_equipo_grasa,
+                yref="y2",
+                line_dash="dot",
+                line_color="gray",
+                annotation_text=t("Media equipo"),
+                annotation_position="top right"
+            )
 
-    # -------------------------
-    # % GRASA → LÍNEA + PUNTOS
-    # -------------------------
-    fig.add_trace(go.Scatter(
-        x=df["fecha_label"],
-        y=df["ajuste_adiposa_pct"],
-        name=t("% Grasa"),
-        yaxis="y2",
-        mode="lines+markers",
-        line=dict(width=3, color="#E74C3C"),
-        marker=dict(size=10),
-        hovertemplate=(
-            "<b>" + t("% Grasa") + "</b><br>"
-            + "%{x}<br>"
-            + "%{y:.1f} %"
-            + "<extra></extra>"
-        )
-    ))
+        # -------------------------
+        # REFERENCIA POSICIÓN (% grasa)
+        # -------------------------
+        if referencia_posicion_grasa:
+            min_ref, max_ref = referencia_posicion_grasa
+            fig.add_hrect(
+                y0=min_ref,
+                y1=max_ref,
+                yref="y2",
+                fillcolor="green",
+                opacity=0.08,
+                line_width=0
+            )
 
-    # -------------------------
-    # MEDIA EQUIPO (% grasa)
-    # -------------------------
-    if media_equipo_grasa is not None:
-        fig.add_hline(
-            y=media_equipo_grasa,
-            yref="y2",
-            line_dash="dot",
-            line_color="gray",
-            annotation_text=t("Media equipo"),
-            annotation_position="top right"
+        # -------------------------
+        # LAYOUT FINAL
+        # -------------------------
+        fig.update_layout(
+            template="plotly_white",
+            barmode="group",
+            bargap=0.25,
+            xaxis=dict(
+                type="category",
+                title=""
+            ),
+            yaxis=dict(
+                title=t("Peso (kg)"),
+                range=[peso_min - margen, peso_max + margen],
+                showgrid=True,
+                gridcolor="rgba(0,0,0,0.06)"
+            ),
+            yaxis2=dict(
+                title=t("% Grasa"),
+                overlaying="y",
+                side="right",
+                showgrid=False
+            ),
+            legend=dict(
+                orientation="h",
+                y=-0.25,
+                x=0.5,
+                xanchor="center"
+            ),
+            showlegend=True
         )
 
-    # -------------------------
-    # REFERENCIA POSICIÓN (% grasa)
-    # -------------------------
-    if referencia_posicion_grasa:
-        min_ref, max_ref = referencia_posicion_grasa
-        fig.add_hrect(
-            y0=min_ref,
-            y1=max_ref,
-            yref="y2",
-            fillcolor="green",
-            opacity=0.08,
-            line_width=0
-        )
+        return fig
 
-    # -------------------------
-    # LAYOUT FINAL
-    # -------------------------
-    fig.update_layout(
-        template="plotly_white",
-        barmode="group",
-        bargap=0.25,
-        xaxis=dict(
-            type="category",
-            title=""
-        ),
-        yaxis=dict(
-            title=t("Peso (kg)"),
-            range=[peso_min - margen, peso_max + margen],
-            showgrid=True,
-            gridcolor="rgba(0,0,0,0.06)"
+    st.plotly_chart(
+        cached_figure(
+            "peso_grasa", _figura, df,
+            cols=["fecha_label", "peso_bruto_kg", "ajuste_adiposa_pct"],
+            media_equipo_grasa=media_equipo_grasa,
+            referencia_posicion_grasa=referencia_posicion_grasa,
         ),
-        yaxis2=dict(
-            title=t("% Grasa"),
-            overlaying="y",
-            side="right",
-            showgrid=False
-        ),
-        legend=dict(
-            orientation="h",
-            y=-0.25,
-            x=0.5,
-            xanchor="center"
-        ),
-        showlegend=True
+        use_container_width=True,
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
     _alerta_tendencia_grasa(df)
 
 def _alerta_tendencia_grasa(df: pd.DataFrame):
@@ -292,48 +303,57 @@ def grafico_composicion(df):
         st.info(t("No hay datos suficientes."))
         return
 
-    df = df.sort_values("fecha").reset_index(drop=True).copy()
+    df = df.sort_values("fecha").reset_index(drop=True)
 
     # X indexada
     df["x_idx"] = df.index
     df["fecha_label"] = df["fecha"].dt.strftime("%d %b %Y")
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=df["x_idx"],
-        y=df["ajuste_adiposa_pct"],
-        name=t("% Grasa"),
-        mode="lines+markers"
-    ))
+    def _figura():
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatter(
+            x=df["x_idx"],
+            y=df["ajuste_adiposa_pct"],
+            name=t("% Grasa"),
+            mode="lines+markers"
+        ))
+
+        fig.add_trace(go.Scatter(
+            x=df["x_idx"],
+            y=df["ajuste_muscular_pct"],
+            name=t("% Muscular"),
+            mode="lines+markers"
+        ))
+
+        # -------------------------
+        # EJE X CONTROLADO
+        # -------------------------
+        fig.update_xaxes(
+            tickmode="array",
+            tickvals=df["x_idx"],
+            ticktext=df["fecha_label"],
+            title=t("Fecha de medición"),
+            range=[-0.5, len(df) - 0.5],
+        )
 
-    fig.add_trace(go.Scatter(
-        x=df["x_idx"],
-        y=df["ajuste_muscular_pct"],
-        name=t("% Muscular"),
-        mode="lines+markers"
-    ))
+        fig.update_layout(
+            template="plotly_white",
+            yaxis_title=t("Porcentaje (%)"),
+            legend=dict(orientation="h", y=-0.3),
+            showlegend=True
+        )
 
-    # -------------------------
-    # EJE X CONTROLADO
-    # -------------------------
-    fig.update_xaxes(
-        tickmode="array",
-        tickvals=df["x_idx"],
-        ticktext=df["fecha_label"],
-        title=t("Fecha de medición"),
-        range=[-0.5, len(df) - 0.5],
-    )
+        return fig
 
-    fig.update_layout(
-        template="plotly_white",
-        yaxis_title=t("Porcentaje (%)"),
-        legend=dict(orientation="h", y=-0.3),
-        showlegend=True
+    st.plotly_chart(
+        cached_figure(
+            "composicion", _figura, df,
+            cols=["fecha_label", "ajuste_adiposa_pct", "ajuste_muscular_pct"],
+        ),
+        use_container_width=True,
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
 def grafico_indice_musculo_oseo(df: pd.DataFrame):
     df = _prepare_antropometria_df(df)
 
@@ -341,61 +361,70 @@ def grafico_indice_musculo_oseo(df: pd.DataFrame):
         st.info(t("No hay datos suficientes."))
         return
 
-    df = df.sort_values("fecha").reset_index(drop=True).copy()
+    df = df.sort_values("fecha").reset_index(drop=True)
 
     # X indexada (control total del espaciado)
     df["x_idx"] = df.index
     df["fecha_label"] = df["fecha"].dt.strftime("%d %b %Y")
 
-    fig = go.Figure()
+    def _figura():
+        fig = go.Figure()
+
+        # -------------------------
+        # MODO DE TRAZA
+        # -------------------------
+        if len(df) == 1:
+            mode = "markers+text"
+        elif len(df) == 2:
+            mode = "lines+markers+text"
+        else:
+            mode = "lines+markers"
+
+        fig.add_trace(go.Scatter(
+            x=df["x_idx"],
+            y=df["idx_musculo_oseo"],
+            mode=mode,
+            text=[f"{v:.2f}" for v in df["idx_musculo_oseo"]] if len(df) <= 2 else None,
+            textposition="top center",
+            marker=dict(
+                size=12 if len(df) <= 2 else 8,
+                color="#2563EB",
+                line=dict(width=1, color="white"),
+            ),
+            line=dict(
+                width=2,
+                color="#2563EB",
+            ),
+            showlegend=False
+        ))
+
+        # -------------------------
+        # EJE X CONTROLADO
+        # -------------------------
+        fig.update_xaxes(
+            tickmode="array",
+            tickvals=df["x_idx"],
+            ticktext=df["fecha_label"],
+            title=t("Fecha de medición"),
+            range=[-0.5, len(df) - 0.5],
+        )
 
-    # -------------------------
-    # MODO DE TRAZA
-    # -------------------------
-    if len(df) == 1:
-        mode = "markers+text"
-    elif len(df) == 2:
-        mode = "lines+markers+text"
-    else:
-        mode = "lines+markers"
-
-    fig.add_trace(go.Scatter(
-        x=df["x_idx"],
-        y=df["idx_musculo_oseo"],
-        mode=mode,
-        text=[f"{v:.2f}" for v in df["idx_musculo_oseo"]] if len(df) <= 2 else None,
-        textposition="top center",
-        marker=dict(
-            size=12 if len(df) <= 2 else 8,
-            color="#2563EB",
-            line=dict(width=1, color="white"),
-        ),
-        line=dict(
-            width=2,
-            color="#2563EB",
-        ),
-        showlegend=False
-    ))
+        # -------------------------
+        # ESTILO GENERAL
+        # -------------------------
+        fig.update_layout(
+            template="plotly_white",
+            height=420,
+            margin=dict(l=40, r=40, t=40, b=40),
+            yaxis_title=t("Índice músculo / óseo"),
+        )
 
-    # -------------------------
-    # EJE X CONTROLADO
-    # -------------------------
-    fig.update_xaxes(
-        tickmode="array",
-        tickvals=df["x_idx"],
-        ticktext=df["fecha_label"],
-        title=t("Fecha de medición"),
-        range=[-0.5, len(df) - 0.5],
-    )
+        return fig
 
-    # -------------------------
-    # ESTILO GENERAL
-    # -------------------------
-    fig.update_layout(
-        template="plotly_white",
-        height=420,
-        margin=dict(l=40, r=40, t=40, b=40),
-        yaxis_title=t("Índice músculo / óseo"),
+    st.plotly_chart(
+        cached_figure(
+            "indice_musculo_oseo", _figura, df,
+            cols=["fecha_label", "idx_musculo_oseo"],
+        ),
+        use_container_width=True,
     )
-
-    st.plotly_chart(fig, use_container_width=True)
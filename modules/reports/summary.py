@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pandas as pd
+
+from modules.ui.ui_app import calc_delta
+
+# ============================================================
+# 📊 RESUMEN AGREGADO DE LA PORTADA (KPI snapshot)
+# ============================================================
+
+# Métricas de las tarjetas de la portada (columna → agregación)
+HOME_METRICS = {
+    "peso_bruto_kg": "mean",
+    "ajuste_adiposa_pct": "mean",
+    "ajuste_muscular_pct": "mean",
+    "idx_musculo_oseo": "mean",
+}
+
+# Periodos de la portada → texto (sin traducir) para la ayuda de las tarjetas
+HOME_PERIODOS = {
+    "Última sesión": "última sesión",
+    "Historico": "últimos 6 meses",
+}
+
+# Ventana del periodo "Historico" (igual que filter_df_by_period)
+DIAS_HISTORICO = 180
+
+class KPISnapshot:
+    """
+    Estado mínimo de la plantilla para las tarjetas de la portada:
+
+    - última sesión de cada jugadora (fecha + métricas)
+    - sumas y conteos por fecha de medición (de ahí salen las medias
+      mensuales de cualquier ventana y el número de registros)
+
+    Se construye una vez desde el dataset calculado y después se actualiza
+    sesión a sesión con add_df, sin volver a agrupar el histórico.
+    """
+
+    def __init__(self, metrics=tuple(HOME_METRICS)):
+        self.metrics = tuple(metrics)
+        self._presentes: set[str] = set()
+        self._ultima: dict[str, dict] = {}
+        self._por_fecha: dict[pd.Timestamp, dict] = {}
+        self._lock = threading.Lock()
+        self.creado = time.monotonic()
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "KPISnapshot":
+        snapshot = cls()
+        snapshot.add_df(df)
+        return snapshot
+
+    # ---------------------------------------------------------
+    # Actualización
+    # ---------------------------------------------------------
+    def add_df(self, df: pd.DataFrame) -> None:
+        """Incorpora sesiones calculadas (mismas columnas que get_isak)."""
+        if df is None or df.empty:
+            return
+
+        cols = [m for m in self.metrics if m in df.columns]
+        fechas = pd.to_datetime(df["fecha_medicion"], errors="coerce")
+        valores = df[cols].to_dict("records")
+
+        with self._lock:
+            self._presentes.update(cols)
+
+            for jugadora, fecha, fila in zip(df["identificacion"].astype(str), fechas, valores):
+                if pd.isna(fecha):
+                    continue
+                self._add(jugadora, fecha, fila)
+
+    def _add(self, jugadora: str, fecha: pd.Timestamp, fila: dict) -> None:
+        ultima = self._ultima.get(jugadora)
+        if ultima is None or fecha >= ultima["fecha"]:
+            self._ultima[jugadora] = {"fecha": fecha, **fila}
+
+        bucket = self._por_fecha.setdefault(fecha, {"n": 0})
+        bucket["n"] += 1
+        for var, valor in fila.items():
+            suma = bucket.setdefault(var, [0.0, 0])
+            if not pd.isna(valor):
+                suma[0] += float(valor)
+                suma[1] += 1
+
+    # ---------------------------------------------------------
+    # Lectura
+    # ---------------------------------------------------------
+    def _bloque(self, filas: list[tuple[pd.Timestamp, dict]], n_registros: int) -> dict:
+        """Medias mensuales (por número de mes, como calc_trend) por métrica."""
+        metricas = {}
+
+        for var in self.metrics:
+            if var not in self._presentes:
+                metricas[var] = (float("nan"), [], 0)
+                continue
+
+            por_mes: dict[int, list] = {}
+            for fecha, sumas in filas:
+                acumulado = por_mes.setdefault(fecha.month, [0.0, 0])
+                suma, n = sumas.get(var, (0.0, 0))
+                acumulado[0] += suma
+                acumulado[1] += n
+
+            vals = [
+                s / n if n else float("nan")
+                for _, (s, n) in sorted(por_mes.items())
+            ]
+            valor = round(vals[-1], 1) if vals else 0
+            metricas[var] = (float(valor), vals, float(calc_delta(vals)))
+
+        return {"n_registros": n_registros, "metricas": metricas}
+
+    def home_summary(self) -> dict:
+        """
+        Agregados de la portada, por periodo:
+
+            {
+                "Última sesión": {
+                    "articulo": "última sesión",
+                    "n_registros": 23,
+                    "metricas": {"peso_bruto_kg": (valor, [medias por mes], delta), ...},
+                },
+                ...
+            }
+
+        Mismo resultado que filter_df_by_period + calc_metric_block sobre el
+        dataset completo, en unos cientos de bytes.
+        """
+        with self._lock:
+            if not self._ultima:
+                return {}
+
+            ultimas = [
+                (u["fecha"], {var: (u[var], 1) if not pd.isna(u.get(var)) else (0.0, 0)
+                              for var in self._presentes})
+                for u in self._ultima.values()
+            ]
+
+            limite = max(self._por_fecha) - pd.Timedelta(days=DIAS_HISTORICO)
+            historico = [
+                (fecha, bucket) for fecha, bucket in self._por_fecha.items()
+                if fecha >= limite
+            ]
+            n_historico = sum(bucket["n"] for _, bucket in historico)
+
+            bloques = {
+                "Última sesión": self._bloque(ultimas, len(ultimas)),
+                "Historico": self._bloque(historico, n_historico),
+            }
+
+        return {
+            periodo: {"articulo": HOME_PERIODOS[periodo], **bloque}
+            for periodo, bloque in bloques.items()
+        }
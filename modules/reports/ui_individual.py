@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 from modules.reports.plots_individuales import grafico_composicion, grafico_indice_musculo_oseo, grafico_peso_grasa
-from modules.util.util import (get_photo, clean_image_url, calcular_edad)
+from modules.util.util import (clean_image_url, calcular_edad)
+from modules.util.photo_cache import get_photo_thumbnail, placeholder_image
 from modules.i18n.i18n import t
 
 def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
@@ -52,16 +53,13 @@ def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
     col1, col2, col3 = st.columns([1.6, 2, 2])
 
     with col1:
+        foto = None
         if pd.notna(url_drive) and url_drive and url_drive != "No Disponible":
             direct_url = clean_image_url(url_drive)
             #st.text(direct_url)
-            response = get_photo(direct_url)
-            if response and response.status_code == 200 and 'image' in response.headers.get("Content-Type", ""):
-                st.image(response.content, width=300)
-            else:
-                st.image(f"assets/images/{profile_image}.png", width=300)
-        else:
-            st.image(f"assets/images/{profile_image}.png", width=300)
+            foto = get_photo_thumbnail(direct_url, width=300)
+
+        st.image(foto or placeholder_image(profile_image), width=300)
 
     with col2:
         #st.markdown(f"**:material/sports_soccer: Competición:** {competicion}")
@@ -4,6 +4,8 @@ from datetime import date, timedelta
 
 from modules.app_config.styles import template_COLOR_NORMAL, template_COLOR_INVERTIDO, get_color_template
 from modules.util.util import ordenar_df
+from modules.util.isak_index import latest_positions
+from modules.util.isak_cube import get_cube
 from modules.i18n.i18n import t
 
 W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
@@ -13,11 +15,9 @@ W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
 # ============================================================
 
 def _coerce_numeric(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    out = df.copy()
-    for c in cols:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
-    return out
+    return df.assign(**{
+        c: pd.to_numeric(df[c], errors="coerce") for c in cols if c in df.columns
+    })
 
 def compute_player_template_means(df_in_period_checkin: pd.DataFrame) -> pd.DataFrame:
     """
@@ -30,8 +30,7 @@ def compute_player_template_means(df_in_period_checkin: pd.DataFrame) -> pd.Data
     if df_in_period_checkin.empty:
         return pd.DataFrame(columns=["nombre_jugadora", "prom_w_1_5", "dolor_mean", "en_riesgo"])
 
-    df = df_in_period_checkin.copy()
-    df = _coerce_numeric(df, W_COLS)  # W_COLS = ["recuperacion","energia","sueno","stress","dolor"]
+    df = _coerce_numeric(df_in_period_checkin, W_COLS)  # W_COLS = ["recuperacion","energia","sueno","stress","dolor"]
 
     g = df.groupby("nombre_jugadora", as_index=False)[W_COLS].mean(numeric_only=True)
     g["prom_w_1_5"] = g[W_COLS].mean(axis=1, skipna=True)
@@ -67,27 +66,36 @@ def filter_df_by_period(df: pd.DataFrame, periodo: str):
     """
 
     if df.empty:
-        return df.copy(), ""
+        return df, ""
+
+    # Índice precalculado del dataset: la última sesión por jugadora sale
+    # directamente, sin agrupar el histórico
+    posiciones = latest_positions(df) if periodo == "Última sesión" else None
 
-    df = df.copy()
+    if posiciones is not None:
+        df = df.iloc[posiciones]
 
     # -------------------------
     # Normalizar fecha_medicion
     # -------------------------
-    df["fecha_medicion"] = pd.to_datetime(
+    df = df.assign(fecha_medicion=pd.to_datetime(
         df["fecha_medicion"],
         errors="coerce"
-    )
+    ))
 
     df = df.dropna(subset=["fecha_medicion"])
 
     if df.empty:
-        return df.copy(), ""
+        return df, ""
 
     # -------------------------
     # Lógica de filtrado
     # -------------------------
-    if periodo == "Última sesión":
+    if posiciones is not None:
+        df_filtrado = df
+        texto = t("última sesión")
+
+    elif periodo == "Última sesión":
         df_sorted = df.sort_values("fecha_medicion")
         df_filtrado = (
             df_sorted
@@ -103,7 +111,7 @@ def filter_df_by_period(df: pd.DataFrame, periodo: str):
 
         df_filtrado = df[
             df["fecha_medicion"] >= limite
-        ].copy()
+        ]
 
         texto = t("últimos 6 meses")
 
@@ -131,6 +139,14 @@ def calc_delta(values):
 
 
 def calc_trend(df, by_col, target_col, agg="mean"):
+    # Dataset completo o recortado por fechas (isak_cube.slice_dates): se
+    # lee del cubo de agregados
+    cube = get_cube(df)
+    if cube is not None:
+        vals = cube.trend(by_col, target_col, agg)
+        if vals is not None:
+            return vals
+
     if agg == "sum":
         g = df.groupby(by_col)[target_col].sum().reset_index(name="valor")
     else:
@@ -165,12 +181,12 @@ def calc_alertas(df_periodo: pd.DataFrame, df_completo: pd.DataFrame, periodo: s
 
     # --- Si existen registros tipo 'checkin', los usamos, de lo contrario todo el periodo ---
     if "tipo" in df_periodo.columns:
-        df_in = df_periodo[df_periodo["tipo"].str.lower() == "checkin"].copy()
+        df_in = df_periodo[df_periodo["tipo"].str.lower() == "checkin"]
     else:
         df_in = pd.DataFrame()
 
     # En el modelo actual, el checkout reemplaza el checkin → fallback a todo el periodo
-    base_df = df_in if not df_in.empty else df_periodo.copy()
+    base_df = df_in if not df_in.empty else df_periodo
 
     # --- Calcular riesgo global coherente ---
     try:
@@ -365,8 +381,7 @@ def generar_resumen_periodo(df: pd.DataFrame):
     manteniendo cálculo de riesgo y colores de template.
     """
 
-    # --- Asegurar tipos numéricos ---
-    df_periodo = df.copy()
+    df_periodo = df
 
     if df_periodo.empty:
         st.info("No hay registros disponibles en este periodo.")
@@ -382,9 +397,7 @@ def generar_resumen_periodo(df: pd.DataFrame):
     cols_template = ["recuperacion", "energia", "sueno", "stress", "dolor"]
 
     # --- Asegurar tipos numéricos ---
-    for c in cols_template + ["rpe", "ua"]:
-        if c in df_periodo.columns:
-            df_periodo[c] = pd.to_numeric(df_periodo[c], errors="coerce")
+    df_periodo = _coerce_numeric(df_periodo, cols_template + ["rpe", "ua"])
 
     # --- Promedios generales por jugadora ---
     resumen = (
@@ -5,6 +5,7 @@ import streamlit as st
 import datetime
 import json
 from modules.util.util import get_date_range_input
+from modules.util.isak_index import player_rows
 from modules.i18n.i18n import t
 from modules.schema import MAP_POSICIONES
 from modules.util.util import load_posiciones_traducidas
@@ -51,7 +52,7 @@ def filter_jugadoras_base(
     posicion: str | None
 ) -> pd.DataFrame:
 
-    df = jug_df.copy()
+    df = jug_df
 
     if competicion:
         df = df[df["plantel"] == competicion["codigo"]]
@@ -71,14 +72,13 @@ def filter_jugadoras_sin_registro_hoy(
 
     hoy = date.today()
 
-    records_df = records_df.copy()
-    records_df["_fecha"] = pd.to_datetime(
+    fechas = pd.to_datetime(
         records_df["fecha_medicion"], errors="coerce"
     ).dt.date
 
     ids_registradas_hoy = (
         records_df[
-            (records_df["_fecha"] == hoy)
+            (fechas == hoy)
             & (records_df.get("deleted_at").isna() if "deleted_at" in records_df else True)
         ]["identificacion"]
         .astype(str)
@@ -126,10 +126,7 @@ def select_jugadora(
 
     df_isak = None
     if records_df is not None and not records_df.empty:
-        jugadora_id = str(jugadora.get("identificacion"))
-        df_isak = records_df[
-            records_df["identificacion"].astype(str) == jugadora_id
-        ].copy()
+        df_isak = player_rows(records_df, jugadora.get("identificacion"))
 
     return jugadora, df_isak
 
@@ -216,17 +213,10 @@ def selection_header_registro(jug_df, comp_df, records_df=None):
             persist=False
         )
 
-        df_isak = None
-        if jugadora and records_df is not None:
-            df_isak = records_df[
-                records_df["identificacion"].astype(str)
-                == str(jugadora["identificacion"])
-            ].copy()
-
     with col4:
         tipo = select_tipo_registro(session_id)
 
-    return jugadora, posicion, df_isak, tipo
+    return jugadora, posicion, tipo
 
 #######################################
 #######################################
@@ -276,19 +266,17 @@ def filtrar_registros_reporte(
     if df is None or df.empty:
         return df
 
-    df_filtrado = df.copy()
-
     # --- Jugadora ---
     if jugadora:
-        df_filtrado = df_filtrado[
-            df_filtrado["identificacion"] == jugadora["identificacion"]
-        ]
+        df_filtrado = player_rows(df, jugadora["identificacion"])
+    else:
+        df_filtrado = df
 
     # --- Rango de fechas ---
     if start and end and "fecha_sesion" in df_filtrado:
 
         if pd.api.types.is_datetime64_any_dtype(df_filtrado["fecha_sesion"]):
-            df_filtrado["fecha_sesion"] = df_filtrado["fecha_sesion"].dt.date
+            df_filtrado = df_filtrado.assign(fecha_sesion=df_filtrado["fecha_sesion"].dt.date)
 
         start = start.date() if hasattr(start, "to_pydatetime") else start
         end = end.date() if hasattr(end, "to_pydatetime") else end
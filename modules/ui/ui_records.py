@@ -1,7 +1,6 @@
-import pandas as pd
 import streamlit as st
 
-from modules.db.db_records import build_record_from_isak
+from modules.db.db_records import build_record_from_baseline, get_baseline_isak_db, get_records_scope
 from modules.schema import build_empty_record
 from modules.ui.form_ui import record_form
 from modules.i18n.i18n import t
@@ -26,32 +25,9 @@ def _validate_context(jugadora: dict) -> str | None:
 
     return jugadora_id
 
-def _get_baseline_isak(
-    records_df: pd.DataFrame | None,
-    jugadora_id: str
-) -> dict | None:
-
-    if records_df is None or records_df.empty:
-        return None
-
-    df_jugadora = records_df[
-        records_df["identificacion"].astype(str) == jugadora_id
-    ].copy()
-
-    if "fecha_medicion" in df_jugadora.columns:
-        df_jugadora["fecha_medicion"] = pd.to_datetime(
-            df_jugadora["fecha_medicion"], errors="coerce"
-        )
-
-    baseline_df = (
-        df_jugadora[df_jugadora["tipo_isak"] == "COMPLETO"]
-        .sort_values("fecha_medicion", ascending=False)
-    )
-
-    if baseline_df.empty:
-        return None
-
-    return baseline_df.iloc[0].to_dict()
+def _get_baseline_isak(jugadora_id: str) -> dict | None:
+    """Última sesión COMPLETO de la jugadora (cabecera + RAW), o None."""
+    return get_baseline_isak_db(jugadora_id, scope=get_records_scope())
 
 def _resolve_modo(baseline_isak: dict | None) -> str:
     modo = "SEGUIMIENTO" if baseline_isak else "COMPLETO"
@@ -86,8 +62,8 @@ def _build_base_record(
             username=username,
         )
     else:
-        record = build_record_from_isak(
-            id_isak=baseline_isak["id_isak"],
+        record = build_record_from_baseline(
+            baseline_isak,
             id_jugadora=jugadora_id,
             username=username,
         )
@@ -218,7 +194,7 @@ def _render_preview_tab(record_persist: dict):
         )
         ISAKPresentation.render_resumen(record_persist)
 
-def records_form(jugadora, records_df=None, tipo="formulario"):
+def records_form(jugadora, tipo="formulario"):
 
     if "file_upload_version" not in st.session_state:
         st.session_state.file_upload_version = 0
@@ -234,7 +210,7 @@ def records_form(jugadora, records_df=None, tipo="formulario"):
     if not jugadora_id:
         return
 
-    baseline_isak = _get_baseline_isak(records_df, jugadora_id)
+    baseline_isak = _get_baseline_isak(jugadora_id)
     modo = _resolve_modo(baseline_isak)
 
     username = st.session_state["auth"]["name"].lower()
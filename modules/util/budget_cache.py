@@ -0,0 +1,193 @@
+import copy as _copy
+import functools
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+from modules.app_config.cache_config import CACHE_BUDGET_MB
+from modules.db.db_events import subscribe
+
+# ============================================================
+#  🔹 CACHÉ CON PRESUPUESTO DE MEMORIA (LRU)
+# ============================================================
+#
+# Alternativa a st.cache_data para las cargas que crecen con el uso
+# (una entrada por jugadora × usuario, por filtro, ...). Todas las
+# funciones decoradas comparten un presupuesto global en MB: cada entrada
+# se mide al guardarse y, si se supera el presupuesto, se descartan las
+# menos usadas recientemente. Además del TTL, una entrada puede caducar
+# por un evento de escritura (db_events).
+#
+# Los valores se comparten entre sesiones (como st.cache_resource); con
+# copy=True se devuelve una copia en cada lectura (como st.cache_data).
+
+def estimate_size(value) -> int:
+    """Tamaño aproximado en bytes de un valor cacheado."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "created", "hits")
+
+    def __init__(self, value, size: int, ttl: float | None):
+        self.value = value
+        self.size = size
+        self.created = time.monotonic()
+        self.expires = self.created + ttl if ttl else None
+        self.hits = 0
+
+class BudgetCache:
+    """
+    Almacén LRU de (nombre, clave) → valor con límite de bytes. Seguro
+    entre hilos; las entradas más grandes que el presupuesto no se guardan.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = int(budget_bytes)
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._total = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, name: str, key) -> tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get((name, key))
+            if entry is None:
+                return False, None
+
+            if entry.expires is not None and time.monotonic() >= entry.expires:
+                self._remove((name, key))
+                return False, None
+
+            entry.hits += 1
+            self._entries.move_to_end((name, key))
+            return True, entry.value
+
+    def put(self, name: str, key, value, ttl: float | None = None) -> None:
+        size = estimate_size(value)
+
+        with self._lock:
+            self._remove((name, key))
+            if size > self.budget_bytes:
+                print(f"Caché '{name}': entrada de {size / 1024 ** 2:.1f} MB mayor que el presupuesto, no se guarda")
+                return
+
+            self._entries[(name, key)] = _Entry(value, size, ttl)
+            self._total += size
+
+            while self._total > self.budget_bytes:
+                antigua = next(iter(self._entries))
+                self._remove(antigua)
+                self._evictions += 1
+
+    def clear(self, name: str | None = None) -> None:
+        with self._lock:
+            for clave in [k for k in self._entries if name is None or k[0] == name]:
+                self._remove(clave)
+
+    def _remove(self, clave: tuple) -> None:
+        entry = self._entries.pop(clave, None)
+        if entry is not None:
+            self._total -= entry.size
+
+    def stats(self) -> dict:
+        """Resumen para la página de desarrollo."""
+        ahora = time.monotonic()
+        with self._lock:
+            entradas = [
+                {
+                    "cache": name,
+                    "clave": repr(key)[:120],
+                    "bytes": entry.size,
+                    "aciertos": entry.hits,
+                    "edad_s": round(ahora - entry.created, 1),
+                    "caduca_s": round(entry.expires - ahora, 1) if entry.expires else None,
+                }
+                for (name, key), entry in reversed(self._entries.items())
+            ]
+            return {
+                "total_bytes": self._total,
+                "budget_bytes": self.budget_bytes,
+                "evictions": self._evictions,
+                "entradas": entradas,
+            }
+
+def _copiar(value):
+    # Con copy-on-write, DataFrame.copy() es perezosa: no duplica columnas
+    # hasta que alguien las modifica
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return _copy.deepcopy(value)
+
+_store = BudgetCache(CACHE_BUDGET_MB * 1024 * 1024)
+
+def budget_cache(
+    name: str | None = None,
+    ttl: float | None = None,
+    copy: bool = False,
+    invalidate_on: tuple[str, ...] = (),
+) -> Callable:
+    """
+    Decorador de caché con presupuesto compartido.
+
+    - ttl: segundos de vida de cada entrada (None = sin caducidad)
+    - copy: devolver una copia del valor en cada lectura
+    - invalidate_on: eventos de db_events que vacían esta caché
+
+    La función decorada expone `.clear()`, igual que st.cache_data.
+    Si los argumentos no son hashables se llama sin caché.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        nombre = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+
+            encontrado, value = _store.get(nombre, key)
+            if not encontrado:
+                value = func(*args, **kwargs)
+                _store.put(nombre, key, value, ttl)
+
+            return _copiar(value) if copy else value
+
+        def clear(**_payload) -> None:
+            _store.clear(nombre)
+
+        wrapper.clear = clear
+        for evento in invalidate_on:
+            subscribe(evento, clear)
+
+        return wrapper
+
+    return decorator
+
+def budget_get(name: str, key) -> tuple[bool, object]:
+    """Lectura directa del almacén compartido: (encontrado, valor)."""
+    return _store.get(name, key)
+
+def budget_put(name: str, key, value, ttl: float | None = None) -> None:
+    """Escritura directa en el almacén compartido (cuenta para el presupuesto)."""
+    _store.put(name, key, value, ttl)
+
+def budget_stats() -> dict:
+    """Entradas residentes (más recientes primero), total y presupuesto."""
+    return _store.stats()
+
+def clear_budget_caches() -> None:
+    """Vacía todas las cachés con presupuesto (equivalente a st.cache_data.clear)."""
+    _store.clear()
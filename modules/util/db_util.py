@@ -1,15 +1,47 @@
+import threading
+import time
 
 import pandas as pd
-from modules.db.db_records import get_isak_full
-from modules.util.isak_util import build_record_antropometrico
-from modules.util.util import data_format, expand_all_json_columns
+from modules.db.db_events import data_version, subscribe
+from modules.db.db_records import get_isak_full, get_isak_session_db, get_records_db, get_records_scope
+from modules.reports.summary import KPISnapshot
+from modules.util.budget_cache import budget_cache
+from modules.util.isak_cube import build_isak_cube, slice_dates
+from modules.util.isak_index import build_isak_index
+from modules.util.isak_util import ISAK_ENGINE_VERSION, build_record_antropometrico
+from modules.util.isak_snapshot import read_snapshot, records_fingerprint, write_snapshot
+from modules.util.util import PLANTEL_DEFAULT, compact_dtypes, data_format, expand_all_json_columns
+
+_reconciliando: set[str] = set()
+_reconciliando_lock = threading.Lock()
+
+# KPI snapshot por ámbito, mantenido por los eventos de escritura.
+# Se reconstruye igualmente tras el TTL del dataset por si hubo cambios
+# hechos desde fuera de este proceso.
+KPI_TTL = 36000
+_kpi_snapshots: dict[str, KPISnapshot] = {}
+# Sesiones guardadas que aún no se han sumado al snapshot de su ámbito
+_kpi_pendientes: dict[str, list[int]] = {}
+_kpi_lock = threading.Lock()
+
+def compute_isak(scope: str) -> pd.DataFrame:
+    """
+    Carga las sesiones ISAK del ámbito desde MySQL y calcula la composición
+    corporal de cada una. Escribe el snapshot en disco para el próximo arranque.
+    El snapshot contiene solo el plantel por defecto.
+    """
+    df_raw = get_isak_full(as_df=True, scope=scope, plantel=PLANTEL_DEFAULT)
 
-def get_isak():
-    df_raw = get_isak_full(as_df=True)
-    
     if df_raw.empty:
         return df_raw
 
+    df_final = _calcular_dataset(df_raw)
+
+    write_snapshot(df_final, scope, records_fingerprint(df_raw), ISAK_ENGINE_VERSION)
+    return df_final
+
+def _calcular_dataset(df_raw: pd.DataFrame, plantel: str | None = PLANTEL_DEFAULT) -> pd.DataFrame:
+    """Composición corporal + formato de reporte para un DataFrame ISAK RAW."""
     records_calculados = []
 
     for _, row in df_raw.iterrows():
@@ -18,5 +50,212 @@ def get_isak():
 
     df_final = pd.DataFrame(records_calculados)
     df_final = expand_all_json_columns(df_final)
-    df_final = data_format(df_final)
-    return df_final
+    df_final = data_format(df_final, plantel=plantel).reset_index(drop=True)
+    return _indexar(compact_dtypes(df_final))
+
+def _indexar(df: pd.DataFrame) -> pd.DataFrame:
+    """Índices y cubo de agregados del dataset (ver isak_index / isak_cube)."""
+    return build_isak_cube(build_isak_index(df))
+
+def _reconciliar(scope: str, fingerprint: str):
+    """Compara el snapshot con la BD y lo regenera si hay cambios."""
+    try:
+        actual = records_fingerprint(
+            get_records_db(as_df=True, scope=scope, plantel=PLANTEL_DEFAULT)
+        )
+        if actual != fingerprint:
+            get_isak_full.clear()
+            compute_isak(scope)
+            _get_isak_scope.clear()
+            _invalidar_kpi(scope)
+    except Exception as e:
+        print(f"Error reconciliando snapshot ISAK ({scope}): {e}")
+    finally:
+        with _reconciliando_lock:
+            _reconciliando.discard(scope)
+
+def _reconciliar_en_segundo_plano(scope: str, fingerprint: str):
+    with _reconciliando_lock:
+        if scope in _reconciliando:
+            return
+        _reconciliando.add(scope)
+
+    threading.Thread(
+        target=_reconciliar,
+        args=(scope, fingerprint),
+        name=f"isak-snapshot-{scope}",
+        daemon=True,
+    ).start()
+
+# Los datasets calculados se comparten entre sesiones y reruns (sin copia
+# por lectura). Con copy-on-write, filtrar devuelve vistas y nadie modifica
+# el original. Cuentan para el presupuesto de memoria de budget_cache: cada
+# combinación de filtros es una entrada que se expulsa por LRU.
+@budget_cache(ttl=36000)
+def _get_isak_scope(scope: str) -> pd.DataFrame:
+    snapshot = read_snapshot(scope, ISAK_ENGINE_VERSION)
+
+    if snapshot is not None:
+        df, meta = snapshot
+        _reconciliar_en_segundo_plano(scope, meta["fingerprint"])
+        # Los índices no se guardan en el snapshot: se reconstruyen al leerlo
+        return _indexar(df)
+
+    return compute_isak(scope)
+
+@budget_cache(ttl=36000)
+def _get_isak_filtrado(scope: str, plantel, id_jugadora, start, end) -> pd.DataFrame:
+    df_raw = get_isak_full(
+        as_df=True,
+        scope=scope,
+        plantel=plantel,
+        id_jugadora=id_jugadora,
+        start=start,
+        end=end,
+    )
+
+    if df_raw.empty:
+        return df_raw
+
+    return _calcular_dataset(df_raw, plantel=plantel)
+
+def get_isak(
+    scope: str | None = None,
+    plantel: str | None = PLANTEL_DEFAULT,
+    id_jugadora: str | None = None,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """
+    Dataset ISAK calculado del ámbito (por defecto, el del rol actual).
+
+    El plantel por defecto se sirve desde el snapshot en disco (reconciliado
+    con la BD en segundo plano); un rango de fechas sobre él es un recorte
+    del dataset en memoria, que conserva el cubo de agregados. Con otro
+    plantel o una jugadora solo se consultan y calculan las sesiones que
+    cumplen el filtro (en SQL), con una entrada de caché por combinación de
+    predicados.
+    """
+    scope = scope or get_records_scope()
+
+    if plantel == PLANTEL_DEFAULT and not id_jugadora:
+        return slice_dates(_get_isak_scope(scope), start, end)
+
+    return _get_isak_filtrado(
+        scope,
+        plantel,
+        str(id_jugadora) if id_jugadora else None,
+        start,
+        end,
+    )
+
+def get_isak_jugadora(
+    id_jugadora: str,
+    scope: str | None = None,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """
+    Dataset ISAK calculado de una sola jugadora (mismas columnas que get_isak).
+    Solo consulta y calcula sus sesiones; se cachea por jugadora y ámbito.
+    """
+    return get_isak(scope=scope, id_jugadora=id_jugadora, start=start, end=end)
+
+# ============================================================
+# KPI SNAPSHOT (portada)
+# ============================================================
+
+def _invalidar_kpi(scope: str | None = None):
+    with _kpi_lock:
+        if scope is None:
+            _kpi_snapshots.clear()
+            _kpi_pendientes.clear()
+        else:
+            _kpi_snapshots.pop(scope, None)
+            _kpi_pendientes.pop(scope, None)
+
+def _aplicar_pendientes(scope: str, snapshot: KPISnapshot) -> bool:
+    """
+    Suma al snapshot las sesiones guardadas desde la última lectura. Si
+    alguna falla se descarta el snapshot (False) para reconstruirlo.
+    """
+    with _kpi_lock:
+        pendientes = _kpi_pendientes.pop(scope, [])
+
+    try:
+        for id_isak in pendientes:
+            df_raw = get_isak_session_db(id_isak, scope=scope, plantel=PLANTEL_DEFAULT)
+            if not df_raw.empty:
+                snapshot.add_df(_calcular_dataset(df_raw))
+    except Exception as e:
+        # Mejor reconstruir que servir un snapshot incompleto
+        print(f"Error actualizando KPI snapshot ({scope}): {e}")
+        _invalidar_kpi(scope)
+        return False
+
+    return True
+
+def get_kpi_snapshot(scope: str | None = None) -> KPISnapshot:
+    """
+    KPI snapshot del ámbito. Se construye una vez desde el dataset y luego
+    se le suman, al leerlo, las sesiones guardadas (ver _on_isak_guardado).
+    """
+    scope = scope or get_records_scope()
+
+    with _kpi_lock:
+        snapshot = _kpi_snapshots.get(scope)
+    if (
+        snapshot is not None
+        and time.monotonic() - snapshot.creado < KPI_TTL
+        and _aplicar_pendientes(scope, snapshot)
+    ):
+        return snapshot
+
+    version = data_version()
+    snapshot = KPISnapshot.from_df(_get_isak_scope(scope))
+
+    # Si hubo escrituras mientras se construía, no se guarda: el dataset
+    # de partida podría no incluirlas
+    with _kpi_lock:
+        if version == data_version():
+            _kpi_snapshots[scope] = snapshot
+
+    return snapshot
+
+def get_home_summary(scope: str | None = None) -> dict:
+    """Agregados de la portada (ver KPISnapshot.home_summary) del ámbito."""
+    return get_kpi_snapshot(scope).home_summary()
+
+def _on_isak_guardado(id_isak: int, usuario: str, **_):
+    """
+    Marca la sesión recién confirmada para el KPI snapshot de su ámbito.
+    Se lee y calcula en la próxima lectura, no en el hilo que guarda.
+    """
+    scope = "developer" if usuario == "developer" else "staff"
+
+    with _kpi_lock:
+        if scope in _kpi_snapshots:
+            _kpi_pendientes.setdefault(scope, []).append(id_isak)
+
+def _on_isak_eliminado(**_):
+    # Borrar puede cambiar la "última sesión" de una jugadora: se reconstruye
+    _invalidar_kpi()
+
+def _descartar_datasets(**_):
+    """
+    Los datasets compartidos (budget_cache) no se limpian con
+    st.cache_data.clear(): se descartan en cada escritura.
+    """
+    get_isak_full.clear()
+    _get_isak_scope.clear()
+    _get_isak_filtrado.clear()
+
+def reset_isak_caches():
+    """Descarta datasets ISAK calculados y KPIs (botones de reinicio de caché)."""
+    _descartar_datasets()
+    _invalidar_kpi()
+
+subscribe("isak_guardado", _on_isak_guardado)
+subscribe("isak_guardado", _descartar_datasets)
+subscribe("isak_eliminado", _descartar_datasets)
+subscribe("isak_eliminado", _on_isak_eliminado)
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from modules.util.isak_index import SharedAttr
+
+# ============================================================
+#  🔹 CUBO DE AGREGADOS (jugadora × día × métrica)
+# ============================================================
+#
+# Conteo, suma y suma de cuadrados por jugadora y día de medición para las
+# métricas de los reportes, con la semana y el mes de cada día. Se
+# construye una vez por versión del dataset (junto con isak_index) y viaja
+# en `df.attrs`. Las tendencias por semana / mes (calc_trend → calc_delta)
+# y las medias y dispersiones por jugadora (tabla resumen del reporte
+# grupal) se leen de él agregando celdas, sin recorrer filas.
+#
+# Un rango de fechas corresponde a un tramo contiguo de días: slice_dates
+# recorta el dataset y adjunta el cubo recortado al resultado, así que los
+# reportes de un periodo siguen leyendo del cubo. Cualquier otro filtro
+# deja de coincidir con los id_isak guardados y se usa el cálculo normal
+# con pandas.
+
+CUBE_ATTR = "isak_cube"
+CUBE_NIVELES = ("semana", "mes")
+CUBE_METRICS = (
+    "peso_bruto_kg",
+    "ajuste_adiposa_pct",
+    "ajuste_muscular_pct",
+    "idx_musculo_oseo",
+    "suma_6_pliegues_mm",
+)
+_ESTADISTICOS = ("n", "suma", "suma2")
+
+class AggregateCube:
+    """
+    Lectura del cubo. `celdas` es un DataFrame pequeño con una fila por
+    (identificacion, dia), ordenado por día, con las columnas `semana`,
+    `mes` y "métrica:n" | "métrica:suma" | "métrica:suma2".
+    """
+
+    def __init__(self, celdas: pd.DataFrame, nombres: dict[str, str]):
+        self.celdas = celdas
+        self.nombres = nombres
+
+    def _tiene(self, metric: str, nivel: str = "mes") -> bool:
+        return f"{metric}:n" in self.celdas.columns and nivel in self.celdas.columns
+
+    def _sumas(self, por: str, metric: str) -> pd.DataFrame:
+        cols = [f"{metric}:{e}" for e in _ESTADISTICOS]
+        sumas = self.celdas.groupby(por, sort=True)[cols].sum()
+        sumas.columns = list(_ESTADISTICOS)
+        return sumas
+
+    def slice(self, start=None, end=None) -> "AggregateCube":
+        """Cubo de las celdas con día en [start, end] (ambos opcionales)."""
+        dias = self.celdas["dia"].to_numpy()
+        inicio = np.searchsorted(dias, np.datetime64(pd.Timestamp(start)), "left") if start else 0
+        fin = np.searchsorted(dias, np.datetime64(pd.Timestamp(end)), "right") if end else len(dias)
+        return AggregateCube(self.celdas.iloc[inicio:fin], self.nombres)
+
+    def trend(self, nivel: str, metric: str, agg: str = "mean") -> list | None:
+        """Serie por periodo de todo el grupo (= calc_trend)."""
+        if not self._tiene(metric, nivel):
+            return None
+
+        por_periodo = self._sumas(nivel, metric)
+        if agg == "sum":
+            return por_periodo["suma"].tolist()
+
+        n = por_periodo["n"].to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (por_periodo["suma"].to_numpy() / n).tolist()
+
+    def player_stats(self, metric: str) -> pd.DataFrame | None:
+        """Media, desviación estándar y n por nombre de jugadora."""
+        if not self._tiene(metric):
+            return None
+
+        por_jugadora = self._sumas("identificacion", metric)
+        por_jugadora.index = por_jugadora.index.map(self.nombres)
+        por_jugadora = por_jugadora.groupby(level=0).sum().sort_index()
+
+        n = por_jugadora["n"].to_numpy(dtype=float)
+        suma = por_jugadora["suma"].to_numpy()
+        suma2 = por_jugadora["suma2"].to_numpy()
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = suma / n
+            var = (suma2 - suma * suma / n) / (n - 1)
+
+        return pd.DataFrame(
+            {"media": media, "std": np.sqrt(np.clip(var, 0, None)), "n": n.astype(int)},
+            index=por_jugadora.index.rename("nombre_jugadora"),
+        )
+
+def _dias(df: pd.DataFrame) -> pd.Series:
+    return pd.to_datetime(df["fecha_medicion"], errors="coerce").dt.normalize()
+
+def build_isak_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Adjunta el cubo de agregados a `df` (si tiene las columnas necesarias)."""
+    df.attrs.pop(CUBE_ATTR, None)
+
+    metricas = [m for m in CUBE_METRICS if m in df.columns]
+    niveles = [n for n in CUBE_NIVELES if n in df.columns]
+
+    if df.empty or not metricas or not niveles or not {"id_isak", "identificacion", "fecha_medicion"} <= set(df.columns):
+        return df
+
+    dias = _dias(df)
+    if dias.isna().any() or df[niveles].isna().any().any():
+        return df
+
+    # float64 para las sumas aunque el dataset guarde medidas en float32
+    valores = df[metricas].apply(pd.to_numeric, errors="coerce").astype("float64")
+    jugadoras = df["identificacion"].astype(str)
+
+    # semana / mes dependen solo del día: forman parte de la clave sin
+    # partir celdas
+    claves = [dias.rename("dia"), jugadoras.rename("identificacion")] + [df[n] for n in niveles]
+    agrupado = valores.groupby(claves)
+    estadisticos = {"n": agrupado.count(), "suma": agrupado.sum(), "suma2": (valores ** 2).groupby(claves).sum()}
+
+    celdas = pd.concat(
+        {f"{m}:{e}": estadisticos[e][m] for m in metricas for e in _ESTADISTICOS},
+        axis=1,
+    ).reset_index()
+
+    nombres = (
+        dict(zip(jugadoras, df["nombre_jugadora"]))
+        if "nombre_jugadora" in df.columns
+        else {j: j for j in jugadoras}
+    )
+
+    return _adjuntar(df, AggregateCube(celdas, nombres))
+
+def _adjuntar(df: pd.DataFrame, cube: AggregateCube) -> pd.DataFrame:
+    df.attrs[CUBE_ATTR] = SharedAttr({
+        "ids": df["id_isak"].to_numpy(),
+        "cubo": cube,
+    })
+    return df
+
+def get_cube(df: pd.DataFrame) -> AggregateCube | None:
+    """Cubo de `df` si se construyó exactamente para estas filas."""
+    cube = df.attrs.get(CUBE_ATTR)
+    if not cube or "id_isak" not in df.columns:
+        return None
+
+    if not np.array_equal(df["id_isak"].to_numpy(), cube["ids"]):
+        return None
+
+    return cube["cubo"]
+
+def slice_dates(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Sesiones de `df` con fecha_medicion en [start, end] (días completos,
+    `end` inclusivo, igual que el WHERE de get_isak_full). Si `df` lleva
+    cubo, el resultado lleva el cubo recortado al mismo rango.
+    """
+    if df.empty or not (start or end):
+        return df
+
+    dias = _dias(df)
+    mascara = pd.Series(True, index=df.index)
+    if start:
+        mascara &= dias >= pd.Timestamp(start)
+    if end:
+        mascara &= dias <= pd.Timestamp(end)
+
+    cube = get_cube(df)
+    recorte = df[mascara]
+    recorte.attrs = {k: v for k, v in df.attrs.items() if k != CUBE_ATTR}
+
+    if cube is not None:
+        _adjuntar(recorte, cube.slice(start, end))
+
+    return recorte
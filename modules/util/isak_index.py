@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================
+#  🔹 ÍNDICES PRECALCULADOS DEL DATASET ISAK
+# ============================================================
+#
+# Se construyen una vez cuando se carga / calcula el dataset y viajan con
+# el DataFrame en `df.attrs` (sobreviven a st.cache_data). Como pandas
+# propaga `attrs` a cualquier DataFrame derivado (filtros, copias,
+# ordenaciones), cada lectura valida que el índice siga describiendo el
+# DataFrame recibido; si no, se usa el cálculo normal.
+
+INDEX_ATTR = "isak_index"
+
+class SharedAttr(dict):
+    """
+    Contenido de solo lectura para `df.attrs`. pandas hace deepcopy de
+    `attrs` en cada operación; así el índice se comparte en lugar de
+    copiarse con cada DataFrame derivado.
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+def build_isak_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adjunta a `df`:
+    - filas de cada jugadora: permutación de filas agrupada por jugadora
+      (en el orden del dataset, fecha_medicion DESC) y su rango [inicio, fin)
+    - posición de la última sesión de cada jugadora (si no hay fechas vacías)
+    """
+    df.attrs.pop(INDEX_ATTR, None)
+
+    if df.empty or not {"id_isak", "identificacion", "fecha_medicion"} <= set(df.columns):
+        return df
+
+    ids_isak = df["id_isak"].to_numpy()
+    jugadoras = df["identificacion"].astype(str).to_numpy(dtype=str)
+
+    # Orden estable por jugadora: cada una queda en un tramo contiguo
+    filas = np.argsort(jugadoras, kind="stable")
+    nombres, inicios = np.unique(jugadoras[filas], return_index=True)
+    fines = np.append(inicios[1:], len(filas))
+
+    index = SharedAttr({
+        "n": len(df),
+        "filas": filas,
+        "filas_id": ids_isak[filas],
+        "rangos": {
+            jugadora: (int(inicio), int(fin))
+            for jugadora, inicio, fin in zip(nombres.tolist(), inicios, fines)
+        },
+    })
+
+    fechas = pd.to_datetime(df["fecha_medicion"], errors="coerce")
+    if not fechas.isna().any():
+        # Orden estable por fecha: la última posición de cada jugadora es su
+        # sesión más reciente
+        orden = np.argsort(fechas.to_numpy(), kind="stable")
+        por_fecha = jugadoras[orden]
+
+        _, ultimas = np.unique(por_fecha[::-1], return_index=True)
+        posiciones = np.sort(orden[len(orden) - 1 - ultimas])
+
+        index["ultima_pos"] = posiciones
+        index["ultima_id"] = ids_isak[posiciones]
+
+    df.attrs[INDEX_ATTR] = index
+    return df
+
+def latest_positions(df: pd.DataFrame) -> np.ndarray | None:
+    """
+    Posiciones (iloc) de la última sesión por jugadora, o None si `df` no
+    lleva un índice válido para su contenido actual.
+    """
+    index = _valid_index(df)
+    if index is None or "ultima_pos" not in index:
+        return None
+
+    posiciones = index["ultima_pos"]
+    if not np.array_equal(df["id_isak"].to_numpy()[posiciones], index["ultima_id"]):
+        return None
+
+    return posiciones
+
+def player_rows(df: pd.DataFrame, id_jugadora) -> pd.DataFrame:
+    """
+    Sesiones de una jugadora (mismo resultado y orden que filtrar por
+    `identificacion`). Con índice válido es O(sesiones de la jugadora) y no
+    crea columnas temporales; si no, filtra la columna completa.
+    """
+    jugadora = str(id_jugadora)
+    index = _valid_index(df)
+
+    if index is not None:
+        inicio, fin = index["rangos"].get(jugadora, (0, 0))
+        filas = index["filas"][inicio:fin]
+
+        if np.array_equal(df["id_isak"].to_numpy()[filas], index["filas_id"][inicio:fin]):
+            return df.iloc[filas]
+
+    return df[df["identificacion"].astype(str) == jugadora]
+
+def _valid_index(df: pd.DataFrame) -> dict | None:
+    index = df.attrs.get(INDEX_ATTR)
+    if not index or index["n"] != len(df) or "id_isak" not in df.columns:
+        return None
+    return index
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from modules.app_config import cache_config
+from modules.schema import ISAK_FIELDS
+
+# Campos crudos que intervienen en calcular_antropometria (además de ISAK_FIELDS)
+_CAMPOS_EXTRA = ("sexo_id", "sexo", "edad")
+
+def _normalizar_valor(value):
+    """Valor estable para el hash: numéricos como float, resto como str."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+def memo_key(raw: dict, version: str) -> str:
+    """
+    Hash estable (sha256) del vector de medidas crudas + versión del motor.
+    Dos sesiones con las mismas medidas comparten resultado.
+    """
+    campos = list(ISAK_FIELDS.keys()) + list(_CAMPOS_EXTRA)
+    vector = {campo: _normalizar_valor(raw.get(campo)) for campo in campos}
+
+    payload = json.dumps(
+        {"v": version, "raw": vector},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class IsakMemo:
+    """
+    Memo LRU (thread-safe) de resultados de composición corporal.
+
+    - En memoria: OrderedDict acotado a `maxsize` entradas.
+    - En disco (opcional): un JSON por clave en `disk_dir`, para
+      sobrevivir a reinicios del servidor y expiraciones de caché.
+    """
+
+    def __init__(self, maxsize: int = 4096, disk_dir: str | None = None):
+        self.maxsize = max(1, int(maxsize))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._data: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------
+    # Disco
+    # -------------------------
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> dict | None:
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value: dict) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            # El disco es solo una optimización: si falla, seguimos en memoria
+            pass
+
+    # -------------------------
+    # API
+    # -------------------------
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read_disk(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def _store(self, key: str, value: dict) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+        if disk and self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob("*/*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+@st.cache_resource(show_spinner=False)
+def get_isak_memo() -> IsakMemo:
+    """Memo compartido por todo el proceso (una instancia por servidor)."""
+    disk_dir = cache_config.ISAK_MEMO_DIR if cache_config.ISAK_MEMO_PERSIST else None
+    return IsakMemo(maxsize=cache_config.ISAK_MEMO_MAXSIZE, disk_dir=disk_dir)
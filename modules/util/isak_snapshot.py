@@ -0,0 +1,118 @@
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from modules.app_config import cache_config
+
+# Versión del formato del snapshot (cambiar si cambia su estructura)
+SNAPSHOT_FORMAT_VERSION = 1
+
+_META_KEY = b"dux_snapshot"
+_lock = threading.Lock()
+
+def _snapshot_path(scope: str) -> Path:
+    return Path(cache_config.SNAPSHOT_DIR) / f"isak_{scope}.feather"
+
+def records_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Huella de las cabeceras ISAK (id_isak, fecha_medicion, created_at).
+    Cambia si se añade, elimina o modifica alguna sesión.
+    """
+    if df is None or df.empty:
+        return "0:0"
+
+    cols = [c for c in ("id_isak", "fecha_medicion", "created_at") if c in df.columns]
+    base = df[cols].astype(str).sort_values(cols).reset_index(drop=True)
+    digest = int(pd.util.hash_pandas_object(base, index=False).sum()) & 0xFFFFFFFFFFFFFFFF
+    return f"{len(base)}:{digest:016x}"
+
+def write_snapshot(df: pd.DataFrame, scope: str, fingerprint: str, engine_version: str) -> bool:
+    """
+    Escribe el dataset calculado en un Feather (Arrow IPC) sin compresión,
+    con sello de versión en los metadatos del esquema.
+    Devuelve False si el DataFrame no es convertible a Arrow.
+    """
+    if not cache_config.SNAPSHOT_ENABLED:
+        return False
+
+    meta = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "engine": engine_version,
+        "scope": scope,
+        "fingerprint": fingerprint,
+        "created_at": datetime.datetime.now().replace(microsecond=0).isoformat(),
+    }
+
+    # Los índices de df.attrs se reconstruyen al leer (ver isak_index)
+    df = df.copy(deep=False)
+    df.attrs = {}
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        print(f"Snapshot ISAK no generado ({scope}): {e}")
+        return False
+
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_KEY: json.dumps(meta).encode("utf-8"),
+    })
+
+    path = _snapshot_path(scope)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+
+    with _lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Sin compresión para permitir lecturas mapeadas en memoria (zero-copy)
+            feather.write_feather(table, tmp, compression="uncompressed")
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Snapshot ISAK no escrito ({scope}): {e}")
+            return False
+
+    return True
+
+def read_snapshot(scope: str, engine_version: str) -> tuple[pd.DataFrame, dict] | None:
+    """
+    Lee el snapshot del ámbito con memory-map.
+    Devuelve (df, metadatos) o None si no existe o su versión no coincide.
+    """
+    if not cache_config.SNAPSHOT_ENABLED:
+        return None
+
+    path = _snapshot_path(scope)
+    if not path.exists():
+        return None
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+        meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+    except (pa.ArrowException, OSError, ValueError):
+        return None
+
+    if meta.get("format") != SNAPSHOT_FORMAT_VERSION or meta.get("engine") != engine_version:
+        return None
+
+    # split_blocks evita consolidar columnas: las numéricas sin nulos no se copian
+    df = table.to_pandas(split_blocks=True)
+    return df, meta
+
+def invalidate_snapshots() -> None:
+    """Elimina todos los snapshots (tras escrituras en BD)."""
+    directory = Path(cache_config.SNAPSHOT_DIR)
+    if not directory.exists():
+        return
+
+    with _lock:
+        for path in directory.glob("isak_*.feather"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
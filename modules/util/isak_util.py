@@ -5,8 +5,13 @@ from decimal import Decimal
 import datetime
 from modules.i18n.i18n import t
 from modules.util.util import f0
+from modules.util.isak_memo import get_isak_memo, memo_key
 import streamlit as st
 
+# Versión del motor de cálculo: incrementar al cambiar cualquier fórmula
+# de calcular_antropometria (invalida los resultados memorizados).
+ISAK_ENGINE_VERSION = "1"
+
 def normalize_isak_numeric(record: dict) -> dict:
     """
     Normaliza un record ISAK para cálculos:
@@ -909,6 +914,23 @@ def calcular_antropometria(raw: dict) -> dict:
         "z_raw": z_raw
     }
 
+def calcular_antropometria_memo(raw: dict) -> dict:
+    """
+    calcular_antropometria con memo por contenido.
+    Las medidas de una sesión no cambian tras guardarse, así que el
+    resultado se reutiliza entre reruns, expiraciones de caché y reinicios.
+    """
+    memo = get_isak_memo()
+    key = memo_key(raw, ISAK_ENGINE_VERSION)
+
+    calculos = memo.get(key)
+    if calculos is None:
+        calculos = calcular_antropometria(raw)
+        memo.put(key, calculos)
+
+    # Copia de los dicts anidados para no compartir estado con el memo
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in calculos.items()}
+
 def build_record_antropometrico(raw_record: dict) -> dict:
     """
     Construye un registro antropométrico completo a partir
@@ -923,7 +945,7 @@ def build_record_antropometrico(raw_record: dict) -> dict:
 
     #st.dataframe(record_numeric)
     # 3. Cálculos ISAK
-    calculos = calcular_antropometria(record_numeric)
+    calculos = calcular_antropometria_memo(record_numeric)
 
     # 4. Ensamblado final
     return {
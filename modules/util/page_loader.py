@@ -0,0 +1,52 @@
+import threading
+from typing import Any, Callable
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+def load_page_data(*loaders: Callable[[], Any]) -> tuple:
+    """
+    Ejecuta cargas independientes de una página en paralelo y devuelve
+    sus resultados en el mismo orden.
+
+    Cada carga corre en su propio hilo con el contexto de Streamlit del
+    script actual (session_state, st.error, cachés), así que la latencia en
+    frío pasa a ser la de la carga más lenta y no la suma de todas.
+
+    Ejemplo:
+        jug_df, comp_df, df_records = load_page_data(
+            load_players_db, load_competitions_db, get_isak
+        )
+    """
+    if len(loaders) <= 1:
+        return tuple(loader() for loader in loaders)
+
+    resultados: list[Any] = [None] * len(loaders)
+    errores: list[BaseException | None] = [None] * len(loaders)
+
+    def _run(i: int, loader: Callable[[], Any]):
+        try:
+            resultados[i] = loader()
+        except BaseException as e:  # incluye st.stop() dentro de la carga
+            errores[i] = e
+
+    threads = []
+    for i, loader in enumerate(loaders):
+        thread = threading.Thread(
+            target=_run,
+            args=(i, loader),
+            name=f"page-loader-{getattr(loader, '__name__', i)}",
+            daemon=True,
+        )
+        add_script_run_ctx(thread)
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+    # Mismo comportamiento que la carga secuencial: se propaga el primer error
+    for error in errores:
+        if error is not None:
+            raise error
+
+    return tuple(resultados)
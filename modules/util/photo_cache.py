@@ -0,0 +1,258 @@
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from modules.app_config import cache_config
+from modules.util.util import clean_image_url
+
+# ============================================================
+#  🔹 CACHÉ DE FOTOS DE JUGADORAS (disco + miniaturas)
+# ============================================================
+#
+# Cada URL se descarga una vez y se guarda en PHOTO_DIR junto con una
+# miniatura al tamaño en que se muestra y sus cabeceras de validación
+# (ETag / Last-Modified). Pasado PHOTO_REVALIDATE_S se hace una petición
+# condicional: un 304 solo renueva la marca de tiempo. Si la descarga
+# falla o supera PHOTO_TIMEOUT_S se sirve la copia guardada, o None (el
+# llamador muestra el placeholder).
+#
+# Archivos por URL (clave = sha1 de la URL):
+#   <clave>.json          metadatos (url, etag, last_modified, comprobado)
+#   <clave>.orig          imagen original
+#   <clave>_<px>.<ext>    miniatura de <px> de ancho
+
+PLACEHOLDER = "assets/images/female.png"
+
+# Tras un fallo de descarga no se reintenta la misma URL hasta pasado este
+# tiempo (evita esperar el timeout en cada rerun si el servidor no responde)
+_RETRY_S = 300
+
+_fallos: dict[str, float] = {}
+_locks: dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+def _key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+def _dir() -> Path:
+    return Path(cache_config.PHOTO_DIR)
+
+def _read_meta(key: str) -> dict | None:
+    try:
+        return json.loads((_dir() / f"{key}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(key: str, meta: dict) -> None:
+    path = _dir() / f"{key}.json"
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    tmp.replace(path)
+
+def _thumb_path(key: str, width: int) -> Path | None:
+    for ext in ("jpg", "png"):
+        path = _dir() / f"{key}_{width}.{ext}"
+        if path.exists():
+            return path
+    return None
+
+def _make_thumbnail(key: str, original: bytes, width: int) -> Path | None:
+    """Genera la miniatura de `width` px de ancho (JPEG, o PNG si hay transparencia)."""
+    try:
+        with Image.open(io.BytesIO(original)) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.width > width:
+                img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+
+            if img.mode in ("RGBA", "LA", "P"):
+                path = _dir() / f"{key}_{width}.png"
+                img.save(path, format="PNG", optimize=True)
+            else:
+                path = _dir() / f"{key}_{width}.jpg"
+                img.convert("RGB").save(path, format="JPEG", quality=85, optimize=True)
+            return path
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        print(f"Miniatura no generada ({key}): {e}")
+        return None
+
+def _download(url: str, key: str, meta: dict | None) -> bool:
+    """
+    Descarga (o revalida) la imagen. True si la copia en disco queda al día.
+    """
+    headers = {}
+    if meta and (_dir() / f"{key}.orig").exists():
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=cache_config.PHOTO_TIMEOUT_S)
+    except requests.exceptions.RequestException:
+        return False
+
+    if response.status_code == 304 and headers:
+        _write_meta(key, {**meta, "comprobado": time.time()})
+        return True
+
+    if response.status_code != 200 or "image" not in response.headers.get("Content-Type", ""):
+        return False
+
+    (_dir() / f"{key}.orig").write_bytes(response.content)
+    for viejo in _dir().glob(f"{key}_*.*"):
+        viejo.unlink(missing_ok=True)
+
+    _write_meta(key, {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "comprobado": time.time(),
+    })
+    return True
+
+def cache_photo(url: str, width: int | None = None) -> Path | None:
+    """
+    Asegura que la foto de `url` está en disco (descargando o revalidando
+    si hace falta) y devuelve la ruta de su miniatura, o None si no hay
+    imagen disponible.
+    """
+    if not url:
+        return None
+
+    width = width or cache_config.PHOTO_THUMB_PX
+    key = _key(url)
+
+    with _lock_for(key):
+        _dir().mkdir(parents=True, exist_ok=True)
+        meta = _read_meta(key)
+        original = _dir() / f"{key}.orig"
+
+        ahora = time.time()
+        vigente = (
+            meta is not None
+            and original.exists()
+            and ahora - meta.get("comprobado", 0) < cache_config.PHOTO_REVALIDATE_S
+        )
+        reintentar = ahora - _fallos.get(key, 0) >= _RETRY_S
+
+        if not vigente and reintentar:
+            if _download(url, key, meta):
+                _fallos.pop(key, None)
+            else:
+                _fallos[key] = ahora
+
+        if not original.exists():
+            return None
+
+        thumb = _thumb_path(key, width)
+        if thumb is None:
+            thumb = _make_thumbnail(key, original.read_bytes(), width)
+        return thumb
+
+def get_photo_thumbnail(url: str, width: int | None = None) -> bytes | None:
+    """Miniatura (bytes) de la foto de `url`, o None si no hay imagen."""
+    thumb = cache_photo(url, width)
+    if thumb is None:
+        return None
+    try:
+        return thumb.read_bytes()
+    except OSError:
+        return None
+
+def placeholder_image(nombre: str = "female") -> str:
+    """Ruta de la imagen por defecto (`assets/images/<nombre>.png` si existe)."""
+    path = f"assets/images/{nombre}.png"
+    return path if Path(path).exists() else PLACEHOLDER
+
+# ============================================================
+#  🔹 PRECARGA DE FOTOS DE LA PLANTILLA
+# ============================================================
+#
+# Descarga y genera las miniaturas de todas las fotos en paralelo, con un
+# límite de conexiones simultáneas por servidor. Se lanza en segundo plano
+# cada vez que se recarga la lista de jugadoras (load_players_db), así
+# ninguna petición de usuario espera por la red para mostrar una foto.
+
+def squad_photo_urls(jug_df) -> list[str]:
+    """URLs directas (sin duplicados) de la columna foto_url."""
+    if jug_df is None or "foto_url" not in jug_df.columns:
+        return []
+
+    urls = []
+    for url in jug_df["foto_url"].dropna():
+        if not url or url == "No Disponible":
+            continue
+        direct_url = clean_image_url(url)
+        if direct_url and direct_url not in urls:
+            urls.append(direct_url)
+    return urls
+
+def prefetch_photos(urls, width: int | None = None) -> dict:
+    """
+    Asegura en disco la foto y miniatura de cada URL. Las ya vigentes no
+    generan tráfico. Devuelve {"ok": n, "sin_imagen": n, "segundos": s}.
+    """
+    urls = list(urls)
+    if not urls:
+        return {"ok": 0, "sin_imagen": 0, "segundos": 0.0}
+
+    por_host = defaultdict(
+        lambda: threading.BoundedSemaphore(cache_config.PHOTO_PREFETCH_PER_HOST)
+    )
+    semaforos = {url: por_host[urlparse(url).netloc] for url in urls}
+
+    def _una(url: str) -> bool:
+        with semaforos[url]:
+            try:
+                return cache_photo(url, width) is not None
+            except Exception as e:
+                print(f"Precarga de foto fallida ({url}): {e}")
+                return False
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=cache_config.PHOTO_PREFETCH_WORKERS,
+        thread_name_prefix="photo-prefetch",
+    ) as executor:
+        resultados = list(executor.map(_una, urls))
+
+    return {
+        "ok": sum(resultados),
+        "sin_imagen": len(resultados) - sum(resultados),
+        "segundos": round(time.perf_counter() - inicio, 2),
+    }
+
+_prefetch_lock = threading.Lock()
+
+def start_photo_prefetch(jug_df, width: int | None = None) -> threading.Thread | None:
+    """
+    Lanza prefetch_photos en un hilo en segundo plano (uno a la vez; si
+    ya hay una precarga en curso no se lanza otra).
+    """
+    urls = squad_photo_urls(jug_df)
+    if not urls or not _prefetch_lock.acquire(blocking=False):
+        return None
+
+    def _run():
+        try:
+            resumen = prefetch_photos(urls, width)
+            print(f"Precarga de fotos: {resumen}")
+        finally:
+            _prefetch_lock.release()
+
+    thread = threading.Thread(target=_run, name="photo-prefetch", daemon=True)
+    thread.start()
+    return thread
@@ -3,6 +3,8 @@ import streamlit as st
 import random
 from datetime import timedelta, date
 
+from modules.util.isak_index import latest_positions
+
 def generar_valores_antropometria():
     peso = round(random.uniform(55, 75), 1)
     grasa = round(random.uniform(16, 28), 1)
@@ -28,6 +30,15 @@ def filter_last_record_per_player(df: pd.DataFrame) -> pd.DataFrame:
     if "identificacion" not in df.columns or "fecha_sesion" not in df.columns:
         return df
 
+    # Índice precalculado del dataset: solo se tocan las filas de cada jugadora
+    posiciones = latest_positions(df)
+    if posiciones is not None:
+        return (
+            df.iloc[posiciones]
+              .sort_values("fecha_sesion", kind="stable")
+              .reset_index(drop=True)
+        )
+
     return (
         df.sort_values("fecha_sesion")
           .groupby("identificacion", as_index=False)
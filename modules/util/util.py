@@ -2,7 +2,6 @@ import streamlit as st
 import math
 import re
 import numpy as np
-import requests
 import pandas as pd
 from urllib.parse import urlparse, urlunparse
 import unicodedata
@@ -11,8 +10,8 @@ from dateutil.relativedelta import relativedelta  # pip install python-dateutil
 from datetime import date, timedelta
 import re
 import base64
-from modules.schema import MAP_POSICIONES
-from modules.i18n.i18n import t
+from modules.schema import ISAK_DECIMALS, MAP_POSICIONES
+from modules.i18n.i18n import t, translate_labels
 import json
 from difflib import SequenceMatcher
 
@@ -31,7 +30,7 @@ def normalize_name(text: str) -> str:
     return text
 
 def load_posiciones_traducidas() -> dict:
-    return {key: t(valor_es) for key, valor_es in MAP_POSICIONES.items()}
+    return dict(translate_labels(MAP_POSICIONES))
 
 def normalize_text(s):
     """Limpia texto eliminando tildes, espacios invisibles y normalizando Unicode."""
@@ -41,15 +40,6 @@ def normalize_text(s):
     s = unicodedata.normalize("NFKC", s)  # Normaliza forma Unicode
     return s
 
-def get_photo(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Verifica si hubo un error (por ejemplo, 404 o 500)
-    except requests.exceptions.RequestException:
-        response = None  # Si hay un error, no asignamos nada a response
-
-    return response
-
 def centered_text(text : str):
         st.markdown(f"<h3 style='text-align: center;'>{text}</span></h3>",unsafe_allow_html=True)
 
@@ -63,23 +53,59 @@ def right_caption(text: str):
         unsafe_allow_html=True
     )
 
-def data_format(df: pd.DataFrame):
-    # 1. Filtrar garantizando copia
-    df = df[df["plantel"] == "1FF"].copy()
+# Plantel que se analiza por defecto en los reportes
+PLANTEL_DEFAULT = "1FF"
 
-    # 2. Conversión segura a datetime
-    df["fecha_sesion"] = pd.to_datetime(df["fecha_medicion"], errors="coerce")
+def data_format(df: pd.DataFrame, plantel: str | None = PLANTEL_DEFAULT):
+    # 1. Filtrar plantel (None = todos los planteles)
+    if plantel:
+        df = df[df["plantel"] == plantel]
 
-    # 3. Nuevas columnas derivadas
-    df["fecha_dia"] = df["fecha_sesion"].dt.date
-    df["semana"] = df["fecha_sesion"].dt.isocalendar().week
-    df["mes"] = df["fecha_sesion"].dt.month
+    # 2. Conversión segura a datetime
+    fecha_sesion = pd.to_datetime(df["fecha_medicion"], errors="coerce")
+
+    # 3. Nuevas columnas derivadas (assign: no se modifica el DataFrame recibido)
+    df = df.assign(
+        fecha_sesion=fecha_sesion,
+        fecha_dia=fecha_sesion.dt.date,
+        semana=fecha_sesion.dt.isocalendar().week,
+        mes=fecha_sesion.dt.month,
+    )
 
     # 4. Volver a dejar fecha_medicion como date (sin warnings)
     #df["fecha_medicion"] = df["fecha_medicion"].dt.date
 
     return df
 
+# Columnas de texto repetidas en cada sesión
+COLUMNAS_CATEGORIA = ["plantel", "usuario", "tipo_isak", "metodo"]
+COLUMNAS_TEXTO = ["identificacion", "nombre_jugadora"]
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce la memoria del dataset calculado (y el coste de serializarlo a
+    Arrow en st.dataframe / snapshot):
+    - texto de alta cardinalidad → string respaldado por Arrow
+    - texto de baja cardinalidad → category
+    - medidas ISAK (1–2 decimales según ISAK_DECIMALS) → float32
+    Los valores calculados se mantienen en float64.
+    """
+    tipos = {}
+
+    for col in COLUMNAS_TEXTO:
+        if col in df.columns:
+            tipos[col] = pd.StringDtype("pyarrow", na_value=np.nan)
+
+    for col in COLUMNAS_CATEGORIA:
+        if col in df.columns:
+            tipos[col] = "category"
+
+    for col in ISAK_DECIMALS:
+        if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+            tipos[col] = "float32"
+
+    return df.astype(tipos)
+
 def f0(value) -> float:
     """
     Convierte a float de forma segura.
@@ -10,6 +10,7 @@ from modules.i18n.i18n import t
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
 from modules.db.db_records import get_records_db
+from modules.util.page_loader import load_page_data
 
 if st.session_state["auth"]["rol"].lower() not in ["admin", "developer"]:
     st.switch_page("app.py")
@@ -17,11 +18,13 @@ if st.session_state["auth"]["rol"].lower() not in ["admin", "developer"]:
 st.header(t("Administrador de :red[registros]"), divider="red")
 
 # Load reference data
-jug_df = load_players_db()
-comp_df = load_competitions_db()
-records_df = get_records_db()
+jug_df, comp_df, records_df, tipo_ausencia_df = load_page_data(
+    load_players_db,
+    load_competitions_db,
+    get_records_db,
+    lambda: load_catalog_list_db("tipo_ausencia", as_df=True),
+)
 records_df = data_format(records_df)
-tipo_ausencia_df = load_catalog_list_db("tipo_ausencia", as_df=True)
 
 #st.dataframe(template_df)
 
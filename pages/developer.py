@@ -1,7 +1,6 @@
 import os
 import pandas as pd
 import streamlit as st
-import bcrypt
 import time
 from datetime import timedelta, date
 
@@ -12,8 +11,11 @@ from datetime import timedelta, date
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
 from modules.i18n.i18n import t
+from modules.auth_system.passwords import hash_password
 import modules.app_config.config as config
 from modules.schema import new_base_record
+from modules.util.budget_cache import budget_stats, clear_budget_caches
+from modules.util.db_util import reset_isak_caches
 from modules.util.records_util import (
     generar_fechas,
     generar_valores_antropometria,
@@ -40,18 +42,6 @@ if "dev_gen_running" not in st.session_state:
     st.session_state.dev_gen_log = []
     st.session_state.dev_gen_start_ts = None
 
-# ============================
-# SECURITY UTILS
-# ============================
-
-def hash_password(password: str) -> str:
-    if isinstance(password, str):
-        password = password.encode("utf-8")
-    return bcrypt.hashpw(password, bcrypt.gensalt()).decode("utf-8")
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
-
 # ============================
 # UI TABS
 # ============================
@@ -88,8 +78,36 @@ with tabs[0]:
 with tabs[1]:
     if st.button(t("Reiniciar caché")):
         st.cache_data.clear()
+        clear_budget_caches()
+        reset_isak_caches()
         st.success(t("Caché limpiada correctamente."))
 
+    st.subheader(t("Memoria de cachés"))
+
+    stats = budget_stats()
+    total_mb = stats["total_bytes"] / 1024 ** 2
+    budget_mb = stats["budget_bytes"] / 1024 ** 2
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric(t("En uso (MB)"), f"{total_mb:.1f}")
+    c2.metric(t("Presupuesto (MB)"), f"{budget_mb:.0f}")
+    c3.metric(t("Expulsiones"), stats["evictions"])
+    st.progress(min(total_mb / budget_mb, 1.0) if budget_mb else 0.0)
+
+    if stats["entradas"]:
+        entradas_df = pd.DataFrame(stats["entradas"])
+        entradas_df["MB"] = (entradas_df.pop("bytes") / 1024 ** 2).round(3)
+
+        st.dataframe(
+            entradas_df.groupby("cache", sort=False)
+            .agg(entradas=("clave", "size"), MB=("MB", "sum"), aciertos=("aciertos", "sum"))
+            .sort_values("MB", ascending=False),
+        )
+        with st.expander(t("Entradas residentes")):
+            st.dataframe(entradas_df, hide_index=True)
+    else:
+        st.info(t("No hay entradas en caché."))
+
 # ============================================================
 # TAB 3 – GENERADOR ANTROPOMETRÍA (DEV)
 # ============================================================
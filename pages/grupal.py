@@ -4,10 +4,11 @@ import modules.app_config.config as config
 
 from modules.i18n.i18n import t
 from modules.util.db_util import get_isak
+from modules.util.page_loader import load_page_data
 
 config.init_config()
 
-from modules.ui.ui_components import selection_header
+from modules.ui.ui_components import filtrar_registros_reporte, selection_header
 from modules.reports.ui_grupal import group_dashboard
 from modules.db.db_records import get_records_db
 from modules.db.db_players import load_players_db
@@ -16,13 +17,14 @@ from modules.db.db_competitions import load_competitions_db
 st.header(t("Análisis :red[grupal]"), divider="red")
 
 # Load reference data
-jug_df = load_players_db()
-comp_df = load_competitions_db()
-#records_df = get_records_db()
-df_records = get_isak()
+jug_df, comp_df = load_page_data(load_players_db, load_competitions_db)
 #st.dataframe(template_df, hide_index=True)    
 
-df_filtrado, jugadora, start, end = selection_header(jug_df, comp_df, df_records, modo="reporte_grupal")
+_, jugadora, start, end = selection_header(jug_df, comp_df, None, modo="reporte_grupal")
+
+# Recorte por fechas del dataset del plantel ya calculado (ver get_isak)
+df_records = get_isak(start=start, end=end)
+df_filtrado = filtrar_registros_reporte(df_records, jugadora=jugadora, start=start, end=end, modo="reporte_grupal")
 
 #st.dataframe(df, hide_index=True)
 group_dashboard(df_filtrado)
@@ -1,4 +1,7 @@
 
+import datetime
+from functools import partial
+
 import streamlit as st
 
 from modules.app_config import config
@@ -9,6 +12,7 @@ config.init_config()
 from modules.auth_system.auth_core import init_app_state, validate_login
 from modules.i18n.i18n import t
 from modules.db.db_records import get_records_db
+from modules.util.page_loader import load_page_data
 
 from modules.ui.ui_components import selection_header_registro
 from modules.ui.ui_records import records_form
@@ -19,11 +23,13 @@ is_valid = validate_login()
 
 st.header(t("Registro"), divider="red")
 
-# Load reference data
-records_df = get_records_db()
-jug_df = load_players_db()
-comp_df = load_competitions_db()
+# Load reference data (solo los registros de hoy: sirven para ocultar a
+# las jugadoras ya medidas en el día)
+hoy = datetime.date.today()
+records_hoy, jug_df, comp_df = load_page_data(
+    partial(get_records_db, start=hoy, end=hoy), load_players_db, load_competitions_db
+)
 
-jugadora, posicion, record_df, tipo = selection_header_registro(jug_df, comp_df, records_df)
+jugadora, posicion, tipo = selection_header_registro(jug_df, comp_df, records_hoy)
 
-records_form(jugadora, record_df, tipo)
+records_form(jugadora, tipo)
@@ -1,3 +1,11 @@
+import time
+from http.cookies import SimpleCookie
+from types import SimpleNamespace
+import bcrypt
+
+import streamlit
+import streamlit.runtime.context as st_context
+
 import pytest
 
 # Mock Streamlit.session_state
@@ -14,6 +22,7 @@ st = MockStreamlit()
 
 # Importamos el módulo real y sustituimos st
 import modules.auth_system.auth_core as auth_core
+import modules.auth_system.cookie_manager as cookie_manager
 auth_core.st = st
 
 def test_init_app_state():
@@ -125,3 +134,107 @@ def test_validate_access_success(monkeypatch):
     assert auth["rol"] == "Coach"
     assert auth["token"] == "FAKE_TOKEN"
     assert auth["session_id"] == "12345"
+
+
+def test_get_current_user_reutiliza_el_payload_verificado(monkeypatch):
+    """
+    get_current_user solo debe verificar el JWT de nuevo si cambia el token
+    o si está cerca de expirar.
+    """
+
+    st.session_state.clear()
+    auth_core.init_app_state()
+
+    token = auth_core.create_jwt("Admin", "admin@test.com", "Coach")
+    st.session_state["auth"]["token"] = token
+
+    llamadas = []
+    decode_real = auth_core.decode_jwt
+    monkeypatch.setattr(auth_core, "decode_jwt", lambda tk: llamadas.append(tk) or decode_real(tk))
+
+    for _ in range(5):
+        assert auth_core.get_current_user()["user"] == "admin@test.com"
+    assert len(llamadas) == 1
+
+    # Expiración cercana: se verifica otra vez
+    st.session_state["_auth_verified"]["payload"]["exp"] = time.time() + 10
+    auth_core.get_current_user()
+    assert len(llamadas) == 2
+
+
+def test_validate_access_rehash_si_cambia_el_coste(monkeypatch):
+    """
+    Un hash con coste distinto del configurado se regenera al iniciar sesión.
+    """
+
+    st.session_state.clear()
+    auth_core.init_app_state()
+
+    monkeypatch.setattr(auth_core, "cookie_set", lambda *args, **kw: None)
+    monkeypatch.setattr(auth_core.auth_config, "BCRYPT_ROUNDS", 5)
+
+    actualizados = {}
+    monkeypatch.setattr(auth_core, "update_password_hash", lambda uid, h: actualizados.update({uid: h}))
+
+    user = {
+        "id": 7,
+        "email": "admin@test.com",
+        "name": "Admin",
+        "role_name": "Coach",
+        "permissions": auth_core.auth_config.APP_NAME,
+        "password_hash": bcrypt.hashpw(b"1234", bcrypt.gensalt(rounds=4)).decode(),
+    }
+
+    auth_core.validate_access("1234", user)
+
+    assert st.session_state["auth"]["is_logged_in"] is True
+    assert actualizados[7].startswith("$2b$05$")
+    assert bcrypt.checkpw(b"1234", actualizados[7].encode())
+
+
+def test_sesion_en_servidor_se_restaura_solo_con_la_cookie(monkeypatch):
+    """
+    La clave del almacén se entrega solo como cookie en el origen de la app
+    y se lee de la petición (st.context.cookies) en el primer run; sin ella
+    (p. ej. un enlace compartido) no se restaura la sesión.
+    """
+
+    st.session_state.clear()
+    auth_core.init_app_state()
+
+    # Navegador: guarda lo que el iframe escribe en document.cookie y lo
+    # devuelve en la cabecera Cookie de la siguiente petición
+    navegador = SimpleCookie()
+    monkeypatch.setattr(cookie_manager, "_write_app_cookie", navegador.load)
+    monkeypatch.setattr(auth_core, "cookie_set", lambda *args, **kw: None)
+    monkeypatch.setattr(auth_core.bcrypt, "checkpw", lambda pw, ph: True)
+
+    user = {
+        "email": "admin@test.com",
+        "name": "Admin",
+        "role_name": "Coach",
+        "permissions": auth_core.auth_config.APP_NAME,
+        "password_hash": "HASH",
+    }
+    auth_core.validate_access("1234", user)
+
+    nombre = auth_core.auth_config.SESSION_COOKIE_NAME
+    assert navegador[nombre]["samesite"] == "Strict"
+    assert navegador[nombre].value != st.session_state["auth"]["session_id"]
+
+    # st.context real; solo se sustituye la conexión del cliente
+    peticion = {}
+    monkeypatch.setattr(st, "context", streamlit.context, raising=False)
+    monkeypatch.setattr(st_context, "_get_client_context", lambda: SimpleNamespace(cookies=peticion))
+
+    # Pestaña nueva sin la cookie de sesión
+    st.session_state.clear()
+    auth_core.init_app_state()
+    assert auth_core._store_key_from_request() is None
+    assert auth_core._restore_from_store() is False
+
+    # Pestaña nueva con la cookie: restaurada en el primer run
+    peticion.update({k: m.value for k, m in navegador.items()})
+    assert auth_core._store_key_from_request() == navegador[nombre].value
+    assert auth_core._restore_from_store() is True
+    assert st.session_state["auth"]["username"] == "admin@test.com"
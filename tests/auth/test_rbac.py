@@ -0,0 +1,51 @@
+import modules.db.db_login as db_login
+
+PERMISOS = [
+    {"role_name": "Coach", "permission": "antropometria_dux_logrono"},
+    {"role_name": "Coach", "permission": "wellness"},
+    {"role_name": "Invitado", "permission": "wellness"},
+]
+USUARIOS = [
+    {"id": 1, "email": "Coach@Test.com", "name": "Ana",
+     "lastname": "P", "role_name": "Coach", "state_name": "activo"},
+    {"id": 2, "email": "sinrol@test.com", "name": "Eva",
+     "lastname": "Q", "role_name": "Otro", "state_name": "activo"},
+]
+
+
+def test_login_y_permisos_desde_la_cache(monkeypatch):
+    consultas = []
+    hashes = {"coach@test.com": "HASH_1", "sinrol@test.com": "HASH_2"}
+
+    def fake_query(sql, params=None, fetch="all"):
+        consultas.append(sql)
+        if "password_hash" in sql:
+            email = params[0].lower()
+            return {"password_hash": hashes[email]} if email in hashes else None
+        if "role_permissions" in sql:
+            return PERMISOS
+        return USUARIOS
+
+    monkeypatch.setattr(db_login, "query", fake_query)
+    db_login.invalidate_rbac()
+
+    user = db_login.load_user_from_db("coach@test.com")
+    assert user["permissions"] == "antropometria_dux_logrono, wellness"
+    assert "wellness" in user["permission_set"]
+    assert user["password_hash"] == "HASH_1"
+    assert db_login.has_permission("coach@test.com", "antropometria_dux_logrono")
+    assert not db_login.has_permission("coach@test.com", "admin")
+
+    # La caché no guarda hashes: un cambio de contraseña vale al instante
+    assert all("password_hash" not in u for u in db_login.get_rbac().users.values())
+    hashes["coach@test.com"] = "HASH_NUEVO"
+    assert db_login.load_user_from_db("coach@test.com")["password_hash"] == "HASH_NUEVO"
+
+    # Rol sin permisos: igual que el INNER JOIN original
+    assert db_login.load_user_from_db("sinrol@test.com") is None
+    assert db_login.load_user_from_db("nadie@test.com") is None
+
+    # Dos consultas de carga + una consulta de hash por intento de login
+    assert len(consultas) == 2 + 4
+
+    db_login.invalidate_rbac()
@@ -0,0 +1,24 @@
+import time
+
+from modules.auth_system.session_store import SessionStore
+
+
+def test_sesion_en_memoria_caduca_y_se_borra():
+    store = SessionStore()
+    store.put("sid1", "TOKEN", time.time() + 60)
+    store.put("sid2", "VIEJO", time.time() - 1)
+
+    assert store.get("sid1") == "TOKEN"
+    assert store.get("sid2") is None
+    assert store.get(None) is None
+
+    store.delete("sid1")
+    assert store.get("sid1") is None
+
+
+def test_sesion_en_sqlite_sobrevive_al_proceso(tmp_path):
+    path = tmp_path / "sesiones.sqlite"
+    SessionStore(path).put("sid1", "TOKEN", time.time() + 60)
+
+    # Otra instancia (p. ej. tras reiniciar la app) lee el archivo
+    assert SessionStore(path).get("sid1") == "TOKEN"
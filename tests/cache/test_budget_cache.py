@@ -0,0 +1,40 @@
+import pandas as pd
+
+from modules.db.db_events import publish
+from modules.util.budget_cache import BudgetCache, budget_cache, estimate_size
+
+
+def test_expulsa_la_entrada_menos_usada_al_superar_el_presupuesto():
+    cache = BudgetCache(budget_bytes=3000)
+    for i in range(3):
+        cache.put("c", i, b"x" * 900)
+
+    cache.get("c", 0)                 # 0 pasa a ser la más reciente
+    cache.put("c", 3, b"x" * 900)     # expulsa 1
+
+    claves = {e["clave"] for e in cache.stats()["entradas"]}
+    assert claves == {"0", "2", "3"}
+    assert cache.stats()["total_bytes"] <= 3000
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("c", "grande", b"x" * 5000)   # mayor que el presupuesto: no se guarda
+    assert cache.get("c", "grande") == (False, None)
+
+
+def test_decorador_copia_e_invalida_por_evento():
+    llamadas = []
+
+    @budget_cache(name="test_jugadoras", copy=True, invalidate_on=("test_evento",))
+    def cargar(plantel):
+        llamadas.append(plantel)
+        return pd.DataFrame({"id": [1, 2], "plantel": [plantel] * 2})
+
+    df = cargar("1FF")
+    df["id"] = 0                       # no altera la entrada cacheada
+    assert cargar("1FF")["id"].tolist() == [1, 2]
+    assert llamadas == ["1FF"]
+    assert estimate_size(df) > 0
+
+    publish("test_evento")
+    cargar("1FF")
+    assert llamadas == ["1FF", "1FF"]
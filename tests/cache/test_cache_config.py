@@ -0,0 +1,9 @@
+from modules.app_config.cache_config import _flag
+
+
+def test_flag_interpreta_textos_de_secrets():
+    for valor in (True, 1, "1", "true", "TRUE", " yes ", "on"):
+        assert _flag(valor) is True
+
+    for valor in (False, 0, "0", "false", "False", "no", "off", "", None):
+        assert _flag(valor) is False
@@ -0,0 +1,104 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from modules.app_config import cache_config
+from modules.util import photo_cache
+
+
+def _png(size=(800, 600)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def servidor():
+    """Servidor HTTP local que imita el CDN de fotos (ETag + 304)."""
+    estado = {"peticiones": [], "imagen": _png()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            estado["peticiones"].append((self.path, self.headers.get("If-None-Match")))
+            if self.path == "/lenta.png":
+                threading.Event().wait(0.5)
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(estado["imagen"])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    estado["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield estado
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def photo_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_config, "PHOTO_DIR", str(tmp_path))
+    monkeypatch.setattr(photo_cache, "_fallos", {})
+
+
+def test_descarga_una_vez_miniatura_y_revalida_con_etag(servidor, monkeypatch):
+    url = f"{servidor['url']}/foto.png"
+
+    thumb = photo_cache.get_photo_thumbnail(url, width=300)
+    with Image.open(io.BytesIO(thumb)) as img:
+        assert img.size == (300, 225)
+
+    # Dentro del periodo de revalidación: sin red
+    assert photo_cache.get_photo_thumbnail(url, width=300) == thumb
+    assert len(servidor["peticiones"]) == 1
+
+    # Revalidación condicional: 304 y se sirve la copia en disco
+    monkeypatch.setattr(cache_config, "PHOTO_REVALIDATE_S", 0)
+    assert photo_cache.get_photo_thumbnail(url, width=300) == thumb
+    assert servidor["peticiones"][-1] == ("/foto.png", '"v1"')
+
+
+def test_timeout_devuelve_none_y_placeholder(servidor, monkeypatch):
+    monkeypatch.setattr(cache_config, "PHOTO_TIMEOUT_S", 0.1)
+
+    assert photo_cache.get_photo_thumbnail(f"{servidor['url']}/lenta.png") is None
+    assert photo_cache.placeholder_image("no_existe") == photo_cache.PLACEHOLDER
+
+
+def test_precarga_plantilla_limita_conexiones_por_host(servidor, monkeypatch):
+    monkeypatch.setattr(cache_config, "PHOTO_PREFETCH_PER_HOST", 2)
+
+    activos, maximo = [0], [0]
+    cache_real = photo_cache.cache_photo
+    lock = threading.Lock()
+
+    def cache_contado(url, width=None):
+        with lock:
+            activos[0] += 1
+            maximo[0] = max(maximo[0], activos[0])
+        try:
+            return cache_real(url, width)
+        finally:
+            with lock:
+                activos[0] -= 1
+
+    monkeypatch.setattr(photo_cache, "cache_photo", cache_contado)
+
+    jug_df = pd.DataFrame({"foto_url": [f"{servidor['url']}/f{i}.png" for i in range(6)] + [None, "No Disponible"]})
+    resumen = photo_cache.prefetch_photos(photo_cache.squad_photo_urls(jug_df))
+
+    assert resumen["ok"] == 6
+    assert maximo[0] <= 2
+    assert photo_cache.get_photo_thumbnail(f"{servidor['url']}/f3.png") is not None
+    assert len(servidor["peticiones"]) == 6
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+
+from modules.i18n import i18n
+
+
+def test_catalogo_carga_una_vez_y_recarga_si_cambia_el_archivo(tmp_path, monkeypatch):
+    path = tmp_path / "en.json"
+    path.write_text(json.dumps({"Peso": "Weight"}), encoding="utf-8")
+
+    monkeypatch.setattr(i18n, "_LANG_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "_RELOAD_CHECK_S", 0.0)
+    monkeypatch.setattr(i18n, "_catalog", i18n._LangCatalog())
+
+    primera = i18n._load_lang("en")
+    assert primera["Peso"] == "Weight"
+    assert i18n._load_lang("en") is primera          # mismo mtime: sin releer
+
+    path.write_text(json.dumps({"Peso": "Body weight"}), encoding="utf-8")
+    mtime = path.stat().st_mtime + 10
+    os.utime(path, (mtime, mtime))
+
+    assert i18n._load_lang("en")["Peso"] == "Body weight"
+    assert i18n._load_lang("xx") == {}
+
+
+def test_etiquetas_perezosas_siguen_el_idioma_de_la_sesion(tmp_path, monkeypatch):
+    (tmp_path / "en.json").write_text(json.dumps({"Peso (kg)": "Weight (kg)"}), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_LANG_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "_catalog", i18n._LangCatalog())
+
+    estado = {"lang": "es"}
+    monkeypatch.setattr(i18n.st, "session_state", estado)
+
+    etiquetas = {"peso_bruto_kg": i18n.LazyT("Peso (kg)"), "talla": "Talla (cm)"}
+    assert f"{etiquetas['peso_bruto_kg']}" == "Peso (kg)"
+    assert i18n.translate_labels(etiquetas)["peso_bruto_kg"] == "Peso (kg)"
+
+    estado["lang"] = "en"
+    assert str(etiquetas["peso_bruto_kg"]) == "Weight (kg)"
+    assert dict(i18n.translate_labels(etiquetas)) == {"peso_bruto_kg": "Weight (kg)", "talla": "Talla (cm)"}
+    assert i18n.translate_labels(etiquetas) is i18n.translate_labels(etiquetas)
+
+
+def test_etiquetas_concurrentes_con_recargas(tmp_path, monkeypatch):
+    path = tmp_path / "en.json"
+    path.write_text(json.dumps({"Peso": "Weight"}), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_LANG_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "_RELOAD_CHECK_S", 0.0)
+    catalogo = i18n._LangCatalog()
+
+    errores = []
+
+    def sesion(n):
+        try:
+            for i in range(300):
+                items = (("peso", "Peso"), ("k", f"{n}-{i}"))
+                assert catalogo.labels("en", items)["peso"] == "Weight"
+        except Exception as e:
+            errores.append(e)
+
+    def editor():
+        for i in range(50):
+            mtime = path.stat().st_mtime + 1
+            os.utime(path, (mtime, mtime))
+            catalogo.get("en")
+
+    hilos = [threading.Thread(target=sesion, args=(n,)) for n in range(6)]
+    hilos.append(threading.Thread(target=editor))
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert errores == []
@@ -0,0 +1,61 @@
+import re
+import sqlite3
+
+from modules.db import db_records
+
+# Las columnas RAW de cada tabla salen de la propia consulta (alias.columna)
+_TABLAS = {
+    "b": "antropometria_isak_basicos",
+    "p": "antropometria_isak_perimetros",
+    "pl": "antropometria_isak_pliegues",
+    "l": "antropometria_isak_longitudes",
+    "d": "antropometria_isak_diametros",
+}
+
+
+def _bd():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+
+    conn.execute(
+        "CREATE TABLE antropometria_isak (id_isak INTEGER, id_jugadora TEXT, tipo_isak TEXT,"
+        " fecha_medicion TEXT, estatus_id INTEGER, usuario TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE futbolistas (identificacion TEXT, genero TEXT, id_estado INTEGER, competicion TEXT)"
+    )
+    for alias, tabla in _TABLAS.items():
+        columnas = re.findall(rf"\b{alias}\.(\w+)", db_records._ISAK_RAW_SELECT)
+        conn.execute(f"CREATE TABLE {tabla} (id_isak INTEGER, {', '.join(f'{c} REAL' for c in columnas)})")
+
+    return conn
+
+
+def _query(conn):
+    def query(sql, params=None):
+        return [dict(fila) for fila in conn.execute(sql.replace("%s", "?"), params or ())]
+    return query
+
+
+def test_baseline_excluye_jugadoras_inactivas_o_fuera_de_la_plantilla(monkeypatch):
+    conn = _bd()
+    conn.executemany("INSERT INTO futbolistas VALUES (?, ?, ?, '1FF')", [
+        ("activa", "F", 1),
+        ("inactiva", "F", 2),
+        ("masculino", "M", 1),
+    ])
+    conn.executemany("INSERT INTO antropometria_isak VALUES (?, ?, 'COMPLETO', ?, 1, 'staff')", [
+        (1, "activa", "2025-01-10"),
+        (2, "activa", "2025-03-10"),
+        (3, "inactiva", "2025-02-10"),
+        (4, "masculino", "2025-02-10"),
+    ])
+    conn.execute("INSERT INTO antropometria_isak_basicos (id_isak, peso_bruto_kg) VALUES (2, 61.5)")
+    monkeypatch.setattr(db_records, "query", _query(conn))
+
+    baseline = db_records.get_baseline_isak_db.__wrapped__
+    fila = baseline("activa", scope="staff")
+    assert fila["id_isak"] == 2 and fila["peso_bruto_kg"] == 61.5
+
+    assert baseline("inactiva", scope="staff") is None
+    assert baseline("masculino", scope="staff") is None
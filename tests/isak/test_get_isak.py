@@ -0,0 +1,52 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from modules.util import db_util
+from modules.util.isak_cube import build_isak_cube, get_cube
+from modules.util.util import PLANTEL_DEFAULT
+
+
+def _dataset():
+    fechas = pd.date_range("2025-01-01 10:00", periods=60, freq="3D")[::-1]
+    df = pd.DataFrame({
+        "id_isak": np.arange(60),
+        "identificacion": ["10", "11", "12"] * 20,
+        "nombre_jugadora": ["A", "B", "C"] * 20,
+        "fecha_medicion": fechas,
+        "peso_bruto_kg": np.linspace(55, 65, 60),
+    })
+    df["semana"] = df["fecha_medicion"].dt.isocalendar().week
+    df["mes"] = df["fecha_medicion"].dt.month
+    return build_isak_cube(df)
+
+
+def test_rango_de_fechas_del_plantel_por_defecto_recorta_el_dataset(monkeypatch):
+    consultas = []
+    monkeypatch.setattr(db_util, "_get_isak_scope", lambda scope: _dataset())
+    monkeypatch.setattr(db_util, "_get_isak_filtrado", lambda *args: consultas.append(args) or pd.DataFrame())
+
+    start, end = datetime.date(2025, 2, 1), datetime.date(2025, 3, 31)
+    df = db_util.get_isak(scope="staff", start=start, end=end)
+
+    completo = _dataset()
+    esperado = completo[(completo["fecha_medicion"] >= "2025-02-01") & (completo["fecha_medicion"] < "2025-04-01")]
+
+    assert consultas == []
+    assert df["id_isak"].tolist() == esperado["id_isak"].tolist()
+    assert get_cube(df) is not None
+
+
+def test_otro_plantel_o_jugadora_se_filtran_en_sql(monkeypatch):
+    consultas = []
+    monkeypatch.setattr(db_util, "_get_isak_scope", lambda scope: _dataset())
+    monkeypatch.setattr(db_util, "_get_isak_filtrado", lambda *args: consultas.append(args) or pd.DataFrame())
+
+    db_util.get_isak(scope="staff", plantel="2FF", start=datetime.date(2025, 2, 1))
+    db_util.get_isak(scope="staff", plantel=PLANTEL_DEFAULT, id_jugadora=10)
+
+    assert consultas == [
+        ("staff", "2FF", None, datetime.date(2025, 2, 1), None),
+        ("staff", PLANTEL_DEFAULT, "10", None, None),
+    ]
@@ -0,0 +1,69 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from modules.ui.ui_app import calc_trend
+from modules.util.isak_cube import build_isak_cube, get_cube, slice_dates
+
+
+def _df(n=80, seed=3):
+    rng = np.random.default_rng(seed)
+    fechas = (
+        pd.Timestamp("2025-01-01")
+        + pd.to_timedelta(rng.integers(0, 300, n), unit="D")
+        + pd.to_timedelta(rng.integers(8, 20, n), unit="h")
+    )
+    df = pd.DataFrame({
+        "id_isak": np.arange(n),
+        "identificacion": rng.choice(["10", "11", "12"], n),
+        "fecha_medicion": fechas,
+        "peso_bruto_kg": rng.normal(60, 4, n),
+        "idx_musculo_oseo": rng.normal(4, 0.2, n),
+    })
+    df.loc[5, "peso_bruto_kg"] = np.nan
+    df["nombre_jugadora"] = "J" + df["identificacion"]
+    df["semana"] = df["fecha_medicion"].dt.isocalendar().week
+    df["mes"] = df["fecha_medicion"].dt.month
+    return df.sort_values("fecha_medicion", ascending=False, ignore_index=True)
+
+
+def _comprobar_igual_que_pandas(df):
+    cube = get_cube(df)
+    assert cube is not None
+
+    for nivel in ("semana", "mes"):
+        for agg in ("mean", "sum"):
+            esperado = df.groupby(nivel)["peso_bruto_kg"].agg(agg).sort_index().tolist()
+            np.testing.assert_allclose(cube.trend(nivel, "peso_bruto_kg", agg), esperado)
+
+    stats = cube.player_stats("peso_bruto_kg")
+    agrupado = df.groupby("nombre_jugadora")["peso_bruto_kg"]
+    np.testing.assert_allclose(stats["media"], agrupado.mean())
+    np.testing.assert_allclose(stats["std"], agrupado.std())
+
+
+def test_tendencia_y_medias_iguales_que_pandas():
+    _comprobar_igual_que_pandas(build_isak_cube(_df()))
+
+
+def test_rango_de_fechas_lleva_el_cubo_recortado():
+    df = build_isak_cube(_df())
+    start, end = datetime.date(2025, 3, 10), datetime.date(2025, 6, 20)
+
+    recorte = slice_dates(df, start, end)
+    fechas = recorte["fecha_medicion"]
+    assert len(recorte) == ((df["fecha_medicion"] >= "2025-03-10") & (df["fecha_medicion"] < "2025-06-21")).sum()
+    assert fechas.min() >= pd.Timestamp(start) and fechas.max() < pd.Timestamp(end) + pd.Timedelta(days=1)
+
+    _comprobar_igual_que_pandas(recorte)
+
+    # calc_trend (y calc_delta sobre su salida) lee del cubo recortado
+    assert calc_trend(recorte, "mes", "peso_bruto_kg") == get_cube(recorte).trend("mes", "peso_bruto_kg")
+
+
+def test_cubo_no_se_usa_con_otros_filtros():
+    df = build_isak_cube(_df())
+
+    assert get_cube(df[df["identificacion"] == "10"]) is None
+    assert get_cube(slice_dates(df, "2025-03-01")[lambda d: d["mes"] > 5]) is None
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from modules.util.isak_index import build_isak_index, latest_positions, player_rows
+from modules.util.records_util import filter_last_record_per_player
+
+
+def _df():
+    df = pd.DataFrame({
+        "id_isak": [1, 2, 3, 4, 5],
+        "identificacion": ["10", "11", "10", "12", "11"],
+        "fecha_medicion": pd.to_datetime([
+            "2025-03-01", "2025-01-10", "2025-01-01", "2025-02-15", "2025-04-02",
+        ]),
+        "peso_bruto_kg": [60.0, 58.0, 61.0, 55.0, 57.5],
+    })
+    df["fecha_sesion"] = df["fecha_medicion"]
+    return df
+
+
+def test_ultima_sesion_con_indice_igual_que_sin_indice():
+    sin_indice = filter_last_record_per_player(_df())
+    con_indice = filter_last_record_per_player(build_isak_index(_df()))
+
+    pd.testing.assert_frame_equal(con_indice, sin_indice, check_like=False)
+    assert sorted(con_indice["id_isak"]) == [1, 4, 5]
+
+
+def test_indice_se_descarta_en_dataframes_derivados():
+    df = build_isak_index(_df())
+    assert latest_positions(df) is not None
+
+    # pandas propaga attrs: filtrar u ordenar no debe reutilizar posiciones
+    assert latest_positions(df[df["identificacion"] != "12"]) is None
+    assert latest_positions(df.sort_values("peso_bruto_kg").reset_index(drop=True)) is None
+
+
+def test_filas_por_jugadora_igual_que_filtrar_la_columna():
+    df = build_isak_index(_df())
+
+    for jugadora in ["10", "11", "12", 10, "99"]:
+        esperado = df[df["identificacion"] == str(jugadora)]
+        pd.testing.assert_frame_equal(player_rows(df, jugadora), esperado)
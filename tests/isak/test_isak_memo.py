@@ -0,0 +1,73 @@
+import json
+
+from modules.schema import ISAK_FIELDS
+from modules.util import isak_util
+from modules.util.isak_memo import IsakMemo, memo_key
+
+
+def _raw_record(**overrides):
+    raw = {k: (v["media"] if v["media"] is not None else 165.0) for k, v in ISAK_FIELDS.items()}
+    raw.update(overrides)
+    return raw
+
+
+def test_memo_key_estable_e_independiente_del_tipo_numerico():
+    a = _raw_record(peso_bruto_kg=60)
+    b = _raw_record(peso_bruto_kg=60.0)
+
+    assert memo_key(a, "1") == memo_key(b, "1")
+    # Campos no crudos (cabecera, fechas) no afectan a la clave
+    assert memo_key({**a, "id_isak": 7, "usuario": "x"}, "1") == memo_key(a, "1")
+
+
+def test_memo_key_cambia_con_medidas_y_version():
+    raw = _raw_record()
+
+    assert memo_key(raw, "1") != memo_key(_raw_record(peso_bruto_kg=61.2), "1")
+    assert memo_key(raw, "1") != memo_key(raw, "2")
+
+
+def test_lru_expulsa_la_entrada_menos_usada():
+    memo = IsakMemo(maxsize=2)
+    memo.put("a", {"v": 1})
+    memo.put("b", {"v": 2})
+    memo.get("a")
+    memo.put("c", {"v": 3})
+
+    assert memo.get("a") == {"v": 1}
+    assert memo.get("b") is None
+    assert len(memo) == 2
+
+
+def test_persistencia_en_disco(tmp_path):
+    memo = IsakMemo(maxsize=4, disk_dir=str(tmp_path))
+    memo.put("abcd", {"masa_osea_kg": 9.1})
+
+    nuevo = IsakMemo(maxsize=4, disk_dir=str(tmp_path))
+    assert nuevo.get("abcd") == {"masa_osea_kg": 9.1}
+    assert json.loads((tmp_path / "ab" / "abcd.json").read_text()) == {"masa_osea_kg": 9.1}
+
+
+def test_calcular_antropometria_memo_no_recalcula(monkeypatch):
+    memo = IsakMemo(maxsize=8)
+    monkeypatch.setattr(isak_util, "get_isak_memo", lambda: memo)
+
+    llamadas = []
+    original = isak_util.calcular_antropometria
+
+    def contar(raw):
+        llamadas.append(1)
+        return original(raw)
+
+    monkeypatch.setattr(isak_util, "calcular_antropometria", contar)
+
+    raw = _raw_record()
+    primero = isak_util.calcular_antropometria_memo(raw)
+    segundo = isak_util.calcular_antropometria_memo(dict(raw))
+
+    assert len(llamadas) == 1
+    assert primero == segundo == original(raw)
+
+    # El resultado devuelto no comparte dicts anidados con el memo
+    segundo["ajuste_adiposa"]["pct"] = -1
+    assert isak_util.calcular_antropometria_memo(raw)["ajuste_adiposa"]["pct"] != -1
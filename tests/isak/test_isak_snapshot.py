@@ -0,0 +1,42 @@
+import pandas as pd
+
+from modules.app_config import cache_config
+from modules.util import isak_snapshot
+
+
+def _df():
+    return pd.DataFrame({
+        "id_isak": [1, 2, 3],
+        "identificacion": ["10", "11", "10"],
+        "fecha_medicion": pd.to_datetime(["2025-01-01", "2025-02-01", "2025-03-01"]),
+        "peso_bruto_kg": [60.1, 58.4, 60.9],
+    })
+
+
+def test_snapshot_ida_y_vuelta(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_config, "SNAPSHOT_DIR", str(tmp_path))
+    df = _df()
+
+    assert isak_snapshot.write_snapshot(df, "staff", "fp", "1") is True
+
+    leido, meta = isak_snapshot.read_snapshot("staff", "1")
+    pd.testing.assert_frame_equal(leido, df)
+    assert meta["fingerprint"] == "fp"
+    assert meta["scope"] == "staff"
+
+
+def test_snapshot_descartado_si_cambia_el_motor(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_config, "SNAPSHOT_DIR", str(tmp_path))
+    isak_snapshot.write_snapshot(_df(), "staff", "fp", "1")
+
+    assert isak_snapshot.read_snapshot("staff", "2") is None
+
+    isak_snapshot.invalidate_snapshots()
+    assert isak_snapshot.read_snapshot("staff", "1") is None
+
+
+def test_fingerprint_detecta_cambios_y_no_depende_del_orden():
+    df = _df()
+
+    assert isak_snapshot.records_fingerprint(df) == isak_snapshot.records_fingerprint(df.iloc[::-1])
+    assert isak_snapshot.records_fingerprint(df) != isak_snapshot.records_fingerprint(df.iloc[:2])
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from modules.reports.plots_grupales import (
+    X_CORTE,
+    Y_CORTE,
+    clasificar_cuadrantes,
+    cuadrante,
+    etiquetas_perfil,
+)
+
+
+def test_clasificacion_vectorizada_igual_que_fila_a_fila():
+    assert (X_CORTE, Y_CORTE) == (70, 3.80)
+
+    df = pd.DataFrame({
+        "nombre_jugadora": ["ANA", "EVA", "LUCIA", "MARTA", "SARA", "NOA"],
+        "x": [70.0, 70.1, 70.0, 71.0, 45.2, np.nan],
+        "y": [3.80, 3.80, 3.79, 3.70, 4.123, 3.9],
+    })
+
+    res = clasificar_cuadrantes(df)
+
+    assert res["grupo"].tolist() == ["G1", "G2", "G3", "G4", "G1", "G4"]
+    esperado = [cuadrante(fila) for _, fila in df.iterrows()]
+    assert list(zip(res["grupo"], res["color"])) == esperado
+    assert "grupo" not in df.columns
+
+    etiquetas = etiquetas_perfil(res)
+    assert etiquetas.iloc[0] == "Ana (70.0; 3.80)"
+    assert etiquetas.iloc[4] == "Sara (45.2; 4.12)"
+    assert etiquetas.index.equals(df.index)
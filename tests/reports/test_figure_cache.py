@@ -0,0 +1,36 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+from modules.reports import figure_cache
+
+
+def test_figura_se_construye_una_vez_por_datos_idioma_y_opciones(monkeypatch):
+    estado = {"lang": "es"}
+    monkeypatch.setattr(figure_cache.st, "session_state", estado)
+
+    construidas = []
+
+    def build():
+        construidas.append(1)
+        return go.Figure(go.Bar(x=df["nombre_jugadora"], y=df["peso_bruto_kg"]))
+
+    df = pd.DataFrame({"nombre_jugadora": ["A", "B"], "peso_bruto_kg": [60.1, 58.4]})
+
+    spec = figure_cache.cached_figure("test_barras", build, df, col="peso_bruto_kg")
+    assert figure_cache.cached_figure("test_barras", build, df.copy(), col="peso_bruto_kg") == spec
+    assert len(construidas) == 1
+    assert go.Figure(spec).data[0].x == ("A", "B")
+
+    # Cambia el idioma, las opciones o los datos → nueva figura
+    estado["lang"] = "en"
+    figure_cache.cached_figure("test_barras", build, df, col="peso_bruto_kg")
+    figure_cache.cached_figure("test_barras", build, df, col="otra")
+    figure_cache.cached_figure("test_barras", build, df.assign(peso_bruto_kg=[61.0, 58.4]), col="otra")
+    assert len(construidas) == 4
+
+
+def test_huella_depende_del_orden_de_las_filas():
+    df = pd.DataFrame({"nombre_jugadora": ["A", "B"], "peso_bruto_kg": [60.1, 58.4]})
+
+    assert figure_cache.data_fingerprint(df) == figure_cache.data_fingerprint(df.copy())
+    assert figure_cache.data_fingerprint(df) != figure_cache.data_fingerprint(df.iloc[::-1])
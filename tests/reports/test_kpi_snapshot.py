@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from modules.reports.summary import HOME_METRICS, HOME_PERIODOS, KPISnapshot
+from modules.ui.ui_app import calc_metric_block, filter_df_by_period
+
+
+def _df(n=60, seed=7):
+    rng = np.random.default_rng(seed)
+    fechas = pd.Timestamp("2024-06-01") + pd.to_timedelta(rng.integers(0, 400, n), unit="D")
+    df = pd.DataFrame({
+        "identificacion": rng.choice(["10", "11", "12", "13"], n),
+        "fecha_medicion": fechas,
+        "peso_bruto_kg": rng.normal(60, 4, n).round(1),
+        "ajuste_adiposa_pct": rng.normal(20, 2, n).round(2),
+        "ajuste_muscular_pct": rng.normal(45, 2, n).round(2),
+        "idx_musculo_oseo": rng.normal(4, 0.2, n).round(2),
+    })
+    df.loc[3, "peso_bruto_kg"] = np.nan
+    df["mes"] = df["fecha_medicion"].dt.month
+    return df
+
+
+def _iguales(a, b):
+    return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, abs_tol=1e-9)
+
+
+def test_resumen_igual_que_el_calculo_sobre_el_dataset():
+    df = _df()
+    resumen = KPISnapshot.from_df(df).home_summary()
+
+    for periodo in HOME_PERIODOS:
+        df_periodo, _ = filter_df_by_period(df, periodo)
+        assert resumen[periodo]["n_registros"] == len(df_periodo)
+
+        for var, agg in HOME_METRICS.items():
+            valor, chart, delta = calc_metric_block(df_periodo, periodo, var, agg)
+            r_valor, r_chart, r_delta = resumen[periodo]["metricas"][var]
+
+            assert _iguales(r_valor, valor)
+            assert len(r_chart) == len(chart)
+            assert all(_iguales(x, y) for x, y in zip(r_chart, chart))
+            assert _iguales(r_delta, delta)
+
+
+def test_actualizacion_incremental_equivale_a_reconstruir():
+    df = _df()
+    snapshot = KPISnapshot.from_df(df.iloc[:40])
+    snapshot.add_df(df.iloc[40:50])
+    snapshot.add_df(df.iloc[50:])
+
+    incremental = snapshot.home_summary()
+    completo = KPISnapshot.from_df(df).home_summary()
+
+    for periodo in HOME_PERIODOS:
+        assert incremental[periodo]["n_registros"] == completo[periodo]["n_registros"]
+
+        for var in HOME_METRICS:
+            _, chart_a, _ = incremental[periodo]["metricas"][var]
+            _, chart_b, _ = completo[periodo]["metricas"][var]
+            assert all(_iguales(x, y) for x, y in zip(chart_a, chart_b))
+
+
+def _kpi_aislado(monkeypatch, df):
+    from modules.util import db_util
+
+    monkeypatch.setattr(db_util, "_kpi_snapshots", {})
+    monkeypatch.setattr(db_util, "_kpi_pendientes", {})
+    monkeypatch.setattr(db_util, "_get_isak_scope", lambda scope: df.iloc[:50])
+    monkeypatch.setattr(db_util, "_calcular_dataset", lambda df_raw: df_raw)
+    return db_util
+
+
+def test_guardar_no_consulta_y_la_lectura_suma_la_sesion(monkeypatch):
+    df = _df()
+    db_util = _kpi_aislado(monkeypatch, df)
+
+    consultas = []
+    def sesion(id_isak, **kw):
+        consultas.append(id_isak)
+        return df.iloc[[id_isak]]
+    monkeypatch.setattr(db_util, "get_isak_session_db", sesion)
+
+    snapshot = db_util.get_kpi_snapshot("staff")
+    for id_isak in range(50, 60):
+        db_util._on_isak_guardado(id_isak=id_isak, usuario="staff")
+    assert consultas == []
+
+    assert db_util.get_kpi_snapshot("staff") is snapshot
+    assert consultas == list(range(50, 60))
+    assert snapshot.home_summary()["Historico"]["n_registros"] == KPISnapshot.from_df(df).home_summary()["Historico"]["n_registros"]
+
+
+def test_fallo_al_actualizar_reconstruye_el_snapshot(monkeypatch):
+    df = _df()
+    db_util = _kpi_aislado(monkeypatch, df)
+
+    def falla(id_isak, **kw):
+        raise ConnectionError("sin BD")
+    monkeypatch.setattr(db_util, "get_isak_session_db", falla)
+
+    anterior = db_util.get_kpi_snapshot("staff")
+    db_util._on_isak_guardado(id_isak=55, usuario="staff")
+
+    nuevo = db_util.get_kpi_snapshot("staff")
+    assert nuevo is not anterior
+    assert db_util._kpi_pendientes == {}
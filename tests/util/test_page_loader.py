@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from modules.util.page_loader import load_page_data
+
+
+def _carga(valor, espera=0.0, error=None):
+    def loader():
+        time.sleep(espera)
+        if error is not None:
+            raise error
+        return valor
+    return loader
+
+
+def test_resultados_en_el_orden_de_los_argumentos():
+    # La primera carga es la más lenta: termina última pero sale primera
+    resultados = load_page_data(
+        _carga("jugadoras", 0.05),
+        _carga("competiciones", 0.01),
+        _carga("registros"),
+    )
+    assert resultados == ("jugadoras", "competiciones", "registros")
+
+
+def test_cargas_corren_en_hilos_del_loader():
+    hilos = []
+
+    def loader():
+        hilos.append(threading.current_thread())
+        return len(hilos)
+
+    load_page_data(loader, loader)
+
+    assert len(hilos) == 2
+    assert threading.main_thread() not in hilos
+
+
+def test_relanza_el_primer_error_en_el_hilo_del_script():
+    primero = ValueError("jugadoras")
+    segundo = RuntimeError("registros")
+
+    # El primer error en orden de argumentos, aunque otro falle antes
+    with pytest.raises(ValueError) as info:
+        load_page_data(
+            _carga(None, 0.05, primero),
+            _carga("competiciones"),
+            _carga(None, 0, segundo),
+        )
+    assert info.value is primero
+
+
+def test_una_sola_carga_se_ejecuta_en_el_hilo_actual():
+    assert load_page_data(threading.current_thread) == (threading.main_thread(),)
+
+    with pytest.raises(KeyError):
+        load_page_data(_carga(None, 0, KeyError("x")))